@@ -3,26 +3,37 @@
 Card Conjurer Selenium Downloader - Smart Canvas Capture Version (v7.1 - Auto-Retry File Generation)
 
 Captures card images directly from the canvas using toDataURL.
-Can either save images to a local directory (via a temporary zip) or upload them directly to a WebDAV server.
+Can either save images to a local directory or upload them directly to a WebDAV server.
 Includes:
 - Runs in Incognito mode for a clean slate each time.
 - Enhanced post-upload priming: handles general first card quirk and {flavor} text rendering.
 - Optional features for art and set symbol manipulation.
 - Set Symbol Override now always uses live rarity, populating separate fields.
-- Filename format: [name-with-dashes]_[set]_[number].png
+- Filename format: [name-with-dashes]_[set]_[number].png (or .jpg/.webp with --image-format)
 - NEW: Automatically generates a .cardconjurer file for any failed cards, ready for a retry run.
 """
 
 import os
+import re
 import sys
+import string
 import time
 import json
 import logging
 import argparse
+import functools
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 import zipfile
-import base64 
+import queue
+import threading
+import shutil
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future, as_completed
+from io import BytesIO
+import binascii
 import hashlib 
 from typing import Optional, Tuple, Dict, List
 
@@ -37,13 +48,30 @@ except ImportError:
     sys.exit(1)
 # --- END ---
 
+# Pillow is optional; it is only used by --optimize-png.
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# pybase64 (SIMD base64) is optional; it speeds up decoding the captured images. binascii is the fallback.
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+# xxhash is optional; it hashes canvas data URLs faster where the page can't hash its own pixels. hashlib is the fallback.
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException
 
 # --- Web Server Upload Functions (from MtgPng2Pdf.py) ---
 def check_server_file_exists(url: str, debug: bool = False) -> bool:
@@ -94,15 +122,374 @@ def upload_file_to_server(url: str, file_bytes: bytes, mime_type: str, debug: bo
         return False
 # --- END ---
 
+# --- Logging ---
+def _skip_unused_log_record_fields():
+    """Our formats don't use process/thread fields, so stop collecting them on every record. These are process-wide
+    logging settings, so only the CLI entry points (main() and the worker processes) call this, never an import."""
+    logging.logProcesses = False
+    logging.logThreads = False
+    logging.logMultiprocessing = False
+
+@functools.lru_cache(maxsize=None)
+def _log_formatters(worker_tag: str = "") -> Tuple[logging.Formatter, logging.Formatter]:
+    """Returns the (detailed file, simple console) formatters, built once per worker tag."""
+    detailed = logging.Formatter(f'%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - {worker_tag}%(message)s')
+    simple = logging.Formatter(f'%(asctime)s - %(levelname)s - {worker_tag}%(message)s')
+    return detailed, simple
+
+# --- Filename sanitization, compiled once ---
+_RE_NON_WORD = re.compile(r'[^\w\s-]')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_MULTI_DASH = re.compile(r'-+')
+# str.translate table that deletes every ASCII char except alphanumerics, '-' and '_'.
+_FILENAME_ASCII_STRIP = {c: None for c in range(128) if chr(c) not in set(string.ascii_letters + string.digits + '-_')}
+# Same whitelist for non-ASCII names: \w is exactly str.isalnum() plus '_', so this matches the old per-char filter.
+_RE_FILENAME_UNSAFE = re.compile(r'[^\w-]')
+
+@functools.lru_cache(maxsize=1024)
+def _slugify_card_name(card_name: str) -> str:
+    """Lowercase, dash-separated card name. Cached: decks repeat names (basic lands, tokens) many times."""
+    clean_name = _RE_NON_WORD.sub('', card_name.lower())     # Remove special chars except spaces and dashes
+    clean_name = _RE_WHITESPACE.sub('-', clean_name.strip()) # Replace spaces with dashes
+    return _RE_MULTI_DASH.sub('-', clean_name)               # Collapse multiple dashes
+
+# --zip-compression choices. Card images are already compressed, so 'stored' is the default.
+ZIP_COMPRESSION = {'stored': zipfile.ZIP_STORED, 'deflated': zipfile.ZIP_DEFLATED}
+# Level 1 for 'deflated': higher levels cost several times the CPU and gain next to nothing on image data.
+ZIP_DEFLATE_LEVEL = 1
+# Write buffer for the --output-zip file: a few large writes instead of many small header/data ones.
+ZIP_WRITE_BUFFER = 1 << 20
+
+# Default local output directory, resolved once at import.
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "CardConjurer")
+
+# Captured images are cached here, keyed by everything that affects the render (see _card_cache_key).
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "ccDownloader")
+# Bump when a change to the capture makes earlier cached images wrong.
+CACHE_FORMAT_VERSION = 1
+
+IMAGE_FORMATS = {'png': ('image/png', 'png'), 'jpeg': ('image/jpeg', 'jpg'), 'webp': ('image/webp', 'webp')}
+
+# Helpers installed once on the page (see install_js_helpers) so per-card scripts are one short call.
+CC_JS_HELPERS = """
+window.__cc = {
+    getCanvas: function() {
+        for (const s of ['#mainCanvas', '#canvas', 'canvas']) { const c = document.querySelector(s); if (c) return c; }
+        return null;
+    },
+    canvasDataUrl: function(mime) {
+        const c = this.getCanvas();
+        if (!c || c.width === 0 || c.height === 0) return 'canvas_error:no_canvas_or_zero_dims';
+        try { return c.toDataURL(mime || 'image/png'); }
+        catch (e) { console.error('CC Automation: Err toDataURL:', e); return 'canvas_error:to_data_url_failed'; }
+    },
+    // SHA-1 of the raw pixels, hashed in the page so only 40 hex chars cross the driver connection.
+    canvasHash: async function() {
+        const c = this.getCanvas();
+        if (!c || c.width === 0 || c.height === 0) return 'canvas_error:no_canvas_or_zero_dims';
+        if (!(window.crypto && crypto.subtle)) return 'no_subtle';
+        let px;
+        try { px = c.getContext('2d').getImageData(0, 0, c.width, c.height).data; }
+        catch (e) { return 'canvas_error:get_image_data_failed'; }
+        const h = new Uint8Array(await crypto.subtle.digest('SHA-1', px));
+        let s = ''; for (const b of h) s += (b < 16 ? '0' : '') + b.toString(16);
+        return s;
+    },
+    // The whole stabilization loop in one call: waits until canvasHash() differs from `initial` (unless null)
+    // and then repeats `checks` times, with pollWait between polls.
+    // The wait between two canvas polls, on the __ccDraw marker (defined below). `elapsedMs` is the time since the
+    // poll started. Before the change it wakes on the next draw (at most intervalMs after the poll started);
+    // afterwards it waits intervalMs and then until drawing has been quiet for intervalMs, but at most one more
+    // interval, so a card that keeps redrawing still settles on plain hash stability. Never past remainingMs.
+    pollWait: async function(elapsedMs, changed, intervalMs, remainingMs) {
+        const sleep = ms => new Promise(r => setTimeout(r, ms)), draw = window.__ccDraw, now = () => performance.now();
+        const pollStart = now() - elapsedMs, deadline = now() + remainingMs;
+        if (!changed) {
+            while (now() < deadline && now() - pollStart < intervalMs && !(draw && draw.last > pollStart)) await sleep(20);
+        } else {
+            while (now() < deadline && (now() - pollStart < intervalMs
+                   || (draw && now() - draw.last < intervalMs && now() - pollStart < 2 * intervalMs))) await sleep(20);
+        }
+        return true;
+    },
+    waitStable: async function(initial, timeoutMs, checks, intervalMs) {
+        const deadline = performance.now() + timeoutMs;
+        let last = null, stable = 0, changed = initial === null, polls = 0, sameAsInitial = 0;
+        while (performance.now() < deadline) {
+            const pollStart = performance.now(); polls++;
+            const h = await this.canvasHash();
+            if (h === 'no_subtle') return { error: 'no_subtle' };
+            if (h && !h.startsWith('canvas_error:')) {
+                if (last === null) { last = h; if (initial === null) stable = 1; }
+                if (!changed) { if (h !== initial) { changed = true; last = h; stable = 1; } else stable = 0; }
+                if (changed) {
+                    stable = h === last ? stable + 1 : 1; last = h;
+                    if (stable >= checks) { if (h !== initial) return { hash: h, polls: polls }; sameAsInitial++; }
+                }
+            }
+            await this.pollWait(performance.now() - pollStart, changed, intervalMs, deadline - performance.now());
+        }
+        return { error: 'timeout', polls: polls, sameAsInitial: sameAsInitial };
+    },
+    // Starts encoding the canvas and keeps the promise of its bare base64 payload (the 'data:...,' header is cut
+    // off here). toBlob snapshots the canvas synchronously and encodes off the main thread, so the next card can
+    // load while it runs. Returns 'started', null (no canvas) or 'error' (e.g. tainted canvas).
+    startCapture: function(mime, quality) {
+        const c = this.getCanvas();
+        if (!c || c.width === 0 || c.height === 0) return null;
+        try {
+            this.pending = new Promise(r => c.toBlob(r, mime, quality)).then(blob => {
+                if (!blob) return 'error';
+                if (blob.type !== mime) return 'unexpected_type:' + blob.type;
+                return new Promise(r => { const fr = new FileReader(); fr.onload = () => { const u = fr.result; r(u.slice(u.indexOf(',') + 1)); }; fr.onerror = () => r('error'); fr.readAsDataURL(blob); });
+            });
+        } catch (e) { this.pending = null; return 'error'; }
+        return 'started';
+    },
+    // Resolves true once no tracked request is in flight and nothing finished (or was drawn) for idleMs, false at
+    // the deadline, 'missing' without the tracker. Event driven: a single timer is armed for the moment the page
+    // would become idle (or the deadline) and re-armed whenever the tracker reports activity.
+    idle: function(idleMs, timeoutMs) {
+        const net = window.__ccNet; if (!net || !net.listeners) return Promise.resolve('missing');
+        const deadline = performance.now() + timeoutMs;
+        return new Promise(resolve => {
+            let timer = null; const finish = r => { clearTimeout(timer); net.listeners.delete(check); resolve(r); };
+            function check() {
+                clearTimeout(timer); const now = performance.now(), quiet = now - net.last;
+                if (net.pending === 0 && quiet >= idleMs) { finish(true); return; }
+                if (now >= deadline) { finish(false); return; }
+                timer = setTimeout(check, net.pending === 0 ? Math.min(idleMs - quiet, deadline - now) : deadline - now);
+            }
+            net.listeners.add(check); check();
+        });
+    },
+    // Resolves true as soon as the tracker reports a request in flight or one finished after sinceMs (a
+    // performance.now() time), false at the deadline, 'missing' without the tracker.
+    activity: function(sinceMs, timeoutMs) {
+        const net = window.__ccNet; if (!net || !net.listeners) return Promise.resolve('missing');
+        return new Promise(resolve => {
+            let timer = null; const finish = r => { clearTimeout(timer); net.listeners.delete(check); resolve(r); };
+            function check() { if (net.pending > 0 || net.last > sinceMs) finish(true); }
+            net.listeners.add(check); timer = setTimeout(() => finish(false), timeoutMs); check();
+        });
+    },
+    // The optional per-card features in one call and in the order of the per-step methods: set-symbol override
+    // (code plus the card's live rarity), resetSetSymbol(), autoFitArt(). A null wait skips that step; after each
+    // step the page gets to go idle, like wait_for_idle between the separate calls. The set-symbol inputs fetch the
+    // new symbol image only after the page's handlers run, so that step first waits for the fetch to start; the
+    // page being idle before it has is no sign the symbol is in.
+    applyFeatures: async function(opts) {
+        const res = {};
+        const set = (id, v) => { const e = document.querySelector('input#' + id); if (!e) return false; e.value = v;
+            e.dispatchEvent(new Event('input', { bubbles: true })); e.dispatchEvent(new Event('change', { bubbles: true })); return true; };
+        if (opts.setSymbolCode !== null) {
+            const t0 = performance.now(), r = document.querySelector('input#info-rarity');
+            res.rarity = r ? r.value.trim().toUpperCase() : null;
+            res.code = set('set-symbol-code', opts.setSymbolCode);
+            res.raritySet = res.rarity ? set('set-symbol-rarity', res.rarity) : null;
+            res.fetchStarted = await this.activity(t0, opts.setSymbolFetchMs);
+            await this.idle(opts.idleMs, Math.max(0, t0 + opts.setSymbolFetchMs - performance.now()));
+        }
+        for (const [fn, waitMs] of [['resetSetSymbol', opts.resetSetSymbolMs], ['autoFitArt', opts.autoFitArtMs]]) {
+            if (waitMs === null) continue;
+            if (typeof window[fn] !== 'function') { res[fn] = 'not defined'; continue; }
+            try { window[fn](); res[fn] = true; } catch (e) { res[fn] = String(e); }
+            await this.idle(opts.idleMs, waitMs);
+        }
+        return res;
+    },
+    // Selects a saved card and calls the page's loadCard() (skipped when the 'change' handler already took >= 1s).
+    // Resolves once loadCard() has settled and two animation frames have painted, capped at capMs. Background and
+    // occluded tabs (e.g. an attached browser) get no animation frames, so the paint wait there is a short timer.
+    load: function(name, capMs) {
+        const s = document.getElementById('load-card-options'); if (!s) return null;
+        s.value = name;
+        const t0 = performance.now(); s.dispatchEvent(new Event('change', { bubbles: true })); const dispatchMs = performance.now() - t0;
+        let called = false, ret;
+        if (dispatchMs < 1000 && typeof loadCard === 'function') {
+            try { ret = loadCard(name); } catch (e) { return { error: String(e) }; }
+            called = true;
+        }
+        return new Promise(resolve => {
+            const finish = timedOut => resolve({ dispatchMs: dispatchMs, called: called, timedOut: timedOut, readyMs: performance.now() - t0 });
+            setTimeout(() => finish(true), capMs);
+            const painted = () => finish(false);
+            Promise.resolve(ret).catch(() => {}).then(() => {
+                setTimeout(painted, document.visibilityState === 'visible' ? 100 : 0);
+                requestAnimationFrame(() => requestAnimationFrame(painted));
+            });
+        });
+    },
+    // Two-lane FNV-style hash over every 32-bit pixel. Works without crypto.subtle, and is cheaper than encoding
+    // a data URL per poll. Throws on a tainted canvas.
+    pixelHash: function() {
+        const c = this.getCanvas(); if (!c || c.width === 0 || c.height === 0) return null;
+        const px = new Uint32Array(c.getContext('2d').getImageData(0, 0, c.width, c.height).data.buffer);
+        let h1 = 0x811c9dc5, h2 = 0xdeadbeef;
+        for (let i = 0; i < px.length; i++) { const v = px[i]; h1 = Math.imul(h1 ^ v, 16777619); h2 = Math.imul(h2 ^ v, 0x5bd1e995); }
+        const hex = h => (h >>> 0).toString(16).padStart(8, '0');
+        return c.width + 'x' + c.height + ':' + hex(h1) + hex(h2);
+    },
+    // Polls pixelHash() until it holds still for opts.checks polls, then encodes the canvas once. The canvas must
+    // first move off `previous`. The one exception is a card that simply looks like the one before it: when load()
+    // called loadCard() and it resolved and painted (`ld`), an unchanged canvas is accepted once nothing is in
+    // flight and the card canvas has not been drawn on for opts.checks polls' worth of time since load() resolved.
+    waitPixelsStable: async function(previous, ld, opts) {
+        const deadline = performance.now() + opts.timeoutMs, loadedAt = performance.now();
+        const loaded = !!(ld && ld.called && !ld.timedOut), quietMs = opts.checks * opts.intervalMs;
+        const settled = () => {
+            const net = window.__ccNet, draw = window.__ccDraw;
+            return loaded && !(net && net.pending > 0) && performance.now() - Math.max(loadedAt, draw ? draw.last : 0) >= quietMs;
+        };
+        let last = null, stable = 0, changed = previous === null;
+        while (performance.now() < deadline) {
+            const pollStart = performance.now();
+            let h; try { h = this.pixelHash(); } catch (e) { return { error: 'to_data_url_failed' }; }
+            if (h) {
+                if (h !== previous) changed = true;
+                stable = h === last ? stable + 1 : 1; last = h;
+                if ((changed || settled()) && stable >= opts.checks) {
+                    try { return { hash: h, dataUrl: this.getCanvas().toDataURL(opts.mime, opts.quality) }; }
+                    catch (e) { return { error: 'to_data_url_failed' }; }
+                }
+            }
+            await this.pollWait(performance.now() - pollStart, changed || loaded, opts.intervalMs, deadline - performance.now());
+        }
+        return { error: 'timeout' };
+    },
+    // Loads (through load(), like the per-card path) and captures each card in turn.
+    // Returns one {name, dataUrl} or {name, error} per card.
+    captureBatch: async function(names, opts) {
+        const results = []; let previous = null;
+        try { previous = this.pixelHash(); } catch (e) {}
+        for (const name of names) {
+            let r;
+            try {
+                const ld = await this.load(name, opts.loadCapMs);
+                if (!ld) r = { error: "'load-card-options' not found" };
+                else if (ld.error) r = { error: 'loadCard() threw ' + ld.error };
+                else r = await this.waitPixelsStable(previous, ld, opts);
+            } catch (e) { r = { error: String(e) }; }
+            if (r.hash) previous = r.hash;
+            delete r.hash; r.name = name; results.push(r);
+        }
+        return results;
+    },
+    takeCapture: async function() { const p = this.pending; this.pending = null; return p ? await p : null; },
+    capture: async function(mime, quality) { const s = this.startCapture(mime, quality); return s === 'started' ? await this.takeCapture() : s; }
+};
+// Network activity tracker for wait_for_idle: in-flight fetch/XHR/<img> count plus the time of the last
+// finished request. Card Conjurer loads frames, art and set symbols as <img>, so setting an image's src counts
+// as in flight until its load/error event; other resource timings still count as activity.
+if (!window.__ccNet) {
+    // listeners: callbacks run on every activity change, so waiters re-arm their timers instead of polling.
+    window.__ccNet = { pending: 0, last: performance.now(), listeners: new Set() };
+    const net = window.__ccNet, touch = () => { net.last = performance.now(); net.listeners.forEach(f => f()); };
+    const done = () => { net.pending = Math.max(0, net.pending - 1); touch(); };
+    const origFetch = window.fetch;
+    if (origFetch) window.fetch = function() { net.pending++; return origFetch.apply(this, arguments).finally(done); };
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() { net.pending++; this.addEventListener('loadend', done, { once: true }); return origSend.apply(this, arguments); };
+    // An image counts once until it settles; a new src before then replaces the old load, which fires no event.
+    const trackImage = img => {
+        if (img.__ccPending) return;
+        img.__ccPending = true; net.pending++;
+        const settle = () => { img.removeEventListener('load', settle); img.removeEventListener('error', settle); img.__ccPending = false; done(); };
+        img.addEventListener('load', settle); img.addEventListener('error', settle);
+    };
+    const srcDesc = window.HTMLImageElement && Object.getOwnPropertyDescriptor(HTMLImageElement.prototype, 'src');
+    if (srcDesc && srcDesc.set) {
+        Object.defineProperty(HTMLImageElement.prototype, 'src', Object.assign({}, srcDesc, {
+            set: function(v) { if (v) trackImage(this); return srcDesc.set.call(this, v); } }));
+        const origSetAttribute = Element.prototype.setAttribute;
+        Element.prototype.setAttribute = function(name, v) {
+            if (v && this instanceof HTMLImageElement && String(name).toLowerCase() === 'src') trackImage(this);
+            return origSetAttribute.apply(this, arguments);
+        };
+    }
+    try { new PerformanceObserver(touch).observe({ type: 'resource', buffered: false }); } catch (e) {}
+}
+// Canvas draw marker: every 2D draw call on the card canvas stamps __ccDraw.last, so the stabilization loop can
+// wait on rendering activity instead of sleeping a fixed interval between toDataURL polls. Draws on other
+// canvases (spinners, previews) are ignored; the card canvas is looked up again once it leaves the DOM.
+// Card-canvas draws also count as activity for wait_for_idle (net.last only; its pending timer re-reads it), so
+// waits after autoFitArt, resetSetSymbol or a set-symbol change end once the redraw they trigger has settled.
+if (!window.__ccDraw) {
+    window.__ccDraw = { n: 0, last: performance.now() };
+    const draw = window.__ccDraw, net = window.__ccNet, proto = CanvasRenderingContext2D.prototype;
+    const onCardCanvas = ctx => {
+        let t = draw.target;
+        if (!t || !t.isConnected) t = draw.target = window.__cc ? window.__cc.getCanvas() : null;
+        return !!t && ctx.canvas === t;
+    };
+    ['drawImage', 'putImageData', 'fillRect', 'fillText', 'strokeText', 'fill', 'stroke'].forEach(name => {
+        const orig = proto[name];
+        if (typeof orig === 'function') proto[name] = function() {
+            if (onCardCanvas(this)) { draw.n++; draw.last = performance.now(); if (net) net.last = draw.last; }
+            return orig.apply(this, arguments);
+        };
+    });
+}
+"""
+
+# 'data:<mime>;base64,' prefixes and their lengths, computed once.
+DATA_URL_PREFIXES = {mime: f'data:{mime};base64,' for mime, _ in IMAGE_FORMATS.values()}
+PNG_DATA_URL_PREFIX = DATA_URL_PREFIXES['image/png']
+PNG_DATA_URL_PREFIX_LEN = len(PNG_DATA_URL_PREFIX)
+
+# Returned instead of image bytes while a deferred capture is still being encoded in the page.
+PENDING_CAPTURE = object()
+
+# Both accept an ASCII str and skip non-alphabet characters, like the data URLs' base64 payloads need.
+_b64decode = pybase64.b64decode if pybase64 else binascii.a2b_base64
+
+def _data_url_fingerprint(payload: bytes) -> str:
+    """Hashes a canvas data URL for equality checks only, so a non-cryptographic hash is enough.
+    It only has to tell consecutive frames apart, so 64 bits is plenty."""
+    if xxhash: return xxhash.xxh3_64_hexdigest(payload)
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+def _decode_capture_payload(payload) -> Optional[bytes]:
+    """Decodes a bare base64 payload from window.__cc.capture/takeCapture; None for its sentinels."""
+    # Base64 never contains ':', which tells the 'unexpected_type:...' sentinel apart from image data.
+    if not payload or payload == 'error' or ':' in payload[:20]: return None
+    return _b64decode(payload)
+
+def decode_image_data_url(data_url: str, mime_type: str = 'image/png') -> Optional[bytes]:
+    """Decodes a 'data:<mime_type>;base64,...' URL to bytes, or returns None if it isn't one."""
+    prefix = DATA_URL_PREFIXES.get(mime_type) or f'data:{mime_type};base64,'
+    prefix_len = len(prefix)
+    if not data_url or data_url[:prefix_len] != prefix:
+        return None
+    # The prefix has a known length, so slice instead of split(',') and use the C decoder directly.
+    return _b64decode(data_url[prefix_len:])
+
+class PageScriptError(Exception):
+    """A script run through evaluate_js threw inside the page; the message is the page's exception text."""
+
 class CardConjurerDownloader:
     # --- MODIFIED: __init__ to accept server args and new attributes ---
     def __init__(self, url="https://cardconjurer.app:443", output_dir=None, log_level=logging.INFO, **kwargs):
         self.url = url
-        self.output_dir = output_dir or os.path.join(os.path.expanduser("~"), "Downloads", "CardConjurer")
+        self.output_dir = output_dir or DEFAULT_OUTPUT_DIR
         self.driver = None
         self.cards = []
         self.parsed_card_data_map: Dict[str, Dict] = {}
         self._current_active_tab: Optional[str] = None 
+        self._cdp_available: Optional[bool] = None
+        self._canvas_hash_in_page: Optional[bool] = None # False once crypto.subtle turned out to be missing
+        self._last_canvas_png: Optional[Tuple[str, str]] = None # (hash, data URL) of the last data-URL fingerprint
+        self._write_queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self._write_errors: List[Tuple[str, str, Exception]] = []
+        self._staging_dir: Optional[str] = None # per-run dir for '.part' files, removed in one rmtree
+        self._js_helpers_script_id: Optional[str] = None # Page.addScriptToEvaluateOnNewDocument identifier, removed in close()
+        self._own_tab: Optional[str] = None # window handle of the tab opened in an attached browser, closed in close()
+        self._page_api: Dict[str, bool] = {}
+        self._card_option_snapshot: Optional[List[List[str]]] = None
+        self._files_processed = 0 # files handled by process() in this browser session
+        self._element_cache: Dict[str, object] = {} # key -> WebElement for static tabs/buttons (see click_cached)
+        self._button_fallbacks: Dict[str, bool] = {} # js_function -> True once its button wasn't found (see _trigger_page_button)
 
         # --- NEW: Attributes for failed card file generation ---
         self.full_card_list_from_file: List[Dict] = []
@@ -112,12 +499,38 @@ class CardConjurerDownloader:
         self.auto_fit_art_enabled = False
         self.auto_fit_set_symbol_enabled = False
         self.set_symbol_override_code = None
+        self.batch_capture_enabled = True
+        self.batch_capture_chunk_size = 10
 
         # --- Server upload attributes ---
         self.upload_to_server = kwargs.get('upload_to_server', False)
         self.image_server_base_url = kwargs.get('image_server_base_url', None)
         self.output_server_path = kwargs.get('output_server_path', None)
         self.overwrite_server_file = kwargs.get('overwrite_server_file', False)
+        # '<base>/<path>/' joined once; each upload URL is then this prefix plus the file name.
+        self._upload_url_prefix = '/'.join(p for p in [(self.image_server_base_url or '').rstrip('/'), (self.output_server_path or '').strip('/')] if p) + '/'
+        self.worker_id: Optional[int] = kwargs.get('worker_id', None)
+        self.window_size = kwargs.get('window_size') or "1920,1080"
+        self.attach_to_chrome: Optional[str] = kwargs.get('attach_to_chrome', None)
+        self.chrome_user_data_dir: Optional[str] = kwargs.get('chrome_user_data_dir', None)
+        self.chromedriver_path: Optional[str] = kwargs.get('chromedriver_path', None)
+
+        # --- Output image format (png, jpeg, webp) ---
+        self.image_format = kwargs.get('image_format', 'png')
+        self.image_mime_type, self.image_extension = IMAGE_FORMATS[self.image_format]
+        # Encoder quality (0-1) for jpeg/webp; None keeps the browser default. PNG is lossless and ignores it.
+        self.image_quality: Optional[float] = kwargs.get('image_quality', None) if self.image_format != 'png' else None
+        self.output_zip: Optional[str] = kwargs.get('output_zip', None)
+        self.zip_compression: str = kwargs.get('zip_compression', 'stored')
+        self.optimize_png = kwargs.get('optimize_png', False) and self.image_format == 'png'
+        self._optimizer: Optional[ThreadPoolExecutor] = None
+        # --- Capture cache (opt-in): reruns reuse images of cards whose data and render settings are unchanged ---
+        # refresh_cache skips the lookups but still stores every capture, replacing what earlier runs cached.
+        self.refresh_cache = kwargs.get('refresh_cache', False)
+        self.use_cache = kwargs.get('use_cache', False) or self.refresh_cache
+        self.cache_dir = kwargs.get('cache_dir') or DEFAULT_CACHE_DIR
+        self._cache_keys: Dict[str, str] = {} # card name -> cache key, for this run's cards that still need capturing
+        self._frame: Optional[str] = None
         self.debug_mode = log_level == logging.DEBUG
 
         self.delays = {
@@ -126,13 +539,18 @@ class CardConjurerDownloader:
             'js_init': 0.1, 'canvas_stabilize_timeout': 15.0,
             'canvas_stability_checks': 3, 'canvas_stability_interval': 0.33,
             'art_fit_wait': 0.75, 'set_symbol_reset_wait': 0.75,  
-            'set_symbol_fetch_wait': 1.5   
+            'set_symbol_fetch_wait': 1.5, 'card_load_barrier': 5.0
         }
 
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        self.run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S") # used in the log file name
         self.setup_logging(log_level)
         self.logger.info(f"Initialized CC Downloader (v7.1 - Auto-Retry File Generation)")
         self.logger.info(f"URL: {self.url}")
+        if self.image_format != 'png': self.logger.info(f"Image format: {self.image_format} ({self.image_mime_type}, quality: {self.image_quality if self.image_quality is not None else 'browser default'})")
+        if self.optimize_png and Image is None:
+            self.logger.warning("--optimize-png needs Pillow (pip install Pillow / apt install python3-pil); PNGs will be written as captured.")
+            self.optimize_png = False
         if self.upload_to_server:
             self.logger.info(f"UPLOAD MODE: Enabled. Target server: {self.image_server_base_url}, Path: {self.output_server_path}")
         else:
@@ -142,71 +560,235 @@ class CardConjurerDownloader:
         log_dir = Path(self.output_dir) / "logs"
         log_dir.mkdir(exist_ok=True)
         self.logger = logging.getLogger('CardConjurer')
-        self.logger.setLevel(logging.DEBUG) 
-        if self.logger.handlers: self.logger.handlers.clear()
-        dt_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-        s_fmt = '%(asctime)s - %(levelname)s - %(message)s'
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_fn = log_dir / f"cc_v7.1_retry_file_{ts}.log"
-        fh = logging.FileHandler(log_fn); fh.setLevel(logging.DEBUG); fh.setFormatter(logging.Formatter(dt_fmt))
-        ch = logging.StreamHandler(sys.stdout); ch.setLevel(log_level); ch.setFormatter(logging.Formatter(s_fmt))
+        self.logger.setLevel(logging.DEBUG); self.logger.propagate = False
+        # Another downloader in this process with the same log dir/worker keeps its handlers (and log file).
+        log_key = (str(log_dir.resolve()), self.worker_id)
+        if self.logger.handlers and all(getattr(h, '_cc_log_key', None) == log_key for h in self.logger.handlers):
+            for h in self.logger.handlers:
+                if isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler): h.setLevel(log_level)
+            return
+        for h in list(self.logger.handlers): self.logger.removeHandler(h); h.close()
+        dt_fmt, s_fmt = _log_formatters(f"[w{self.worker_id}] " if self.worker_id is not None else "")
+        ts = self.run_timestamp
+        worker_sfx = f"_w{self.worker_id}" if self.worker_id is not None else ""
+        log_fn = log_dir / f"cc_v7.1_retry_file_{ts}{worker_sfx}.log"
+        fh = logging.FileHandler(log_fn); fh.setLevel(logging.DEBUG); fh.setFormatter(dt_fmt)
+        ch = logging.StreamHandler(sys.stdout); ch.setLevel(log_level); ch.setFormatter(s_fmt)
+        fh._cc_log_key = ch._cc_log_key = log_key
         self.logger.addHandler(fh); self.logger.addHandler(ch)
         self.logger.info(f"Logging to: {log_fn}")
 
     # ... (setup_driver to navigate_to_card_conjurer are unchanged) ...
     def setup_driver(self, headless=False):
-        self.logger.info(f"Setting up Chrome driver (headless={headless}) in INCOGNITO mode.")
         chrome_options = Options()
-        chrome_options.add_argument("--incognito") 
-        prefs = {"safebrowsing.enabled": False}
-        chrome_options.add_experimental_option("prefs", prefs)
-        chrome_options.add_argument("--no-sandbox"); chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080"); chrome_options.page_load_strategy='eager'
-        if headless: chrome_options.add_argument("--headless=new"); self.logger.info("Running in headless mode")
+        if self.attach_to_chrome:
+            # Reuse an already running Chrome (started with --remote-debugging-port); launch flags don't apply.
+            self.logger.info(f"Attaching to running Chrome at {self.attach_to_chrome}; launch options are ignored.")
+            chrome_options.add_experimental_option("debuggerAddress", self.attach_to_chrome)
+        else:
+            if self.chrome_user_data_dir:
+                # A persistent profile keeps the HTTP/JS cache between runs; incognito would discard it.
+                self.logger.info(f"Setting up Chrome driver (headless={headless}) with profile dir: {self.chrome_user_data_dir}")
+                chrome_options.add_argument(f"--user-data-dir={os.path.abspath(os.path.expanduser(self.chrome_user_data_dir))}")
+            else:
+                self.logger.info(f"Setting up Chrome driver (headless={headless}) in INCOGNITO mode.")
+                chrome_options.add_argument("--incognito") 
+            prefs = {"safebrowsing.enabled": False}
+            chrome_options.add_experimental_option("prefs", prefs)
+            chrome_options.add_argument("--no-sandbox"); chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument(f"--window-size={self.window_size}"); chrome_options.page_load_strategy='eager'
+            # Background work Chrome would otherwise do alongside every card load.
+            chrome_options.add_argument("--disable-extensions"); chrome_options.add_argument("--disable-background-networking")
+            chrome_options.add_argument("--mute-audio"); chrome_options.add_argument("--disable-features=Translate,TranslateUI,BackForwardCache,OptimizationHints,MediaRouter")
+            chrome_options.add_argument("--disable-sync"); chrome_options.add_argument("--disable-default-apps"); chrome_options.add_argument("--disable-notifications")
+            chrome_options.add_argument("--no-first-run"); chrome_options.add_argument("--no-default-browser-check")
+            # Keep timers/rAF at full rate when the window is hidden or occluded; card renders are paced by them.
+            chrome_options.add_argument("--disable-renderer-backgrounding"); chrome_options.add_argument("--disable-background-timer-throttling")
+            chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+            if headless:
+                chrome_options.add_argument("--headless=new"); chrome_options.add_argument("--disable-gpu")
+                self.logger.info("Running in headless mode")
         
-        chromedriver_paths = ["/usr/bin/chromedriver", "/usr/local/bin/chromedriver", "chromedriver"]
-        chromedriver_path = next((os.path.expanduser(p) for p in chromedriver_paths if os.path.exists(os.path.expanduser(p)) or os.system(f"which {os.path.expanduser(p)} > /dev/null 2>&1") == 0), None)
+        chromedriver_path = self.chromedriver_path or find_chromedriver()
         if not chromedriver_path: self.logger.error("ChromeDriver not found."); raise Exception("ChromeDriver not found.")
         self.logger.info(f"Found chromedriver at: {chromedriver_path}"); service = Service(chromedriver_path)
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.logger.info("Browser setup complete (Incognito).")
-
-    def wait_for_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
+        if self.attach_to_chrome:
+            # Work in a tab of our own, so the page hooks never touch the user's tabs and close() can simply close it.
+            try: self.driver.switch_to.new_window('tab'); self._own_tab = self.driver.current_window_handle
+            except Exception as e: self.logger.warning(f"Could not open a separate tab in the attached browser: {e}")
+        else:
+            # Images are read from the canvas, never downloaded; deny downloads so a stray one can't hit the disk or prompt.
+            try: self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", {"behavior": "deny"})
+            except Exception as e: self.logger.debug("Could not set download behavior via CDP: %s", e)
+        self.logger.info(f"Browser setup complete ({'attached' if self.attach_to_chrome else 'persistent profile' if self.chrome_user_data_dir else 'Incognito'}).")
+
+    @contextmanager
+    def implicit_wait(self, seconds: float):
+        """Scopes a driver-side implicit wait; it is reset to 0 so it never overlaps an explicit WebDriverWait."""
+        self.driver.implicitly_wait(seconds)
+        try: yield
+        finally: self.driver.implicitly_wait(0)
+
+    def find_one(self, selector, by=By.CSS_SELECTOR, timeout=None):
+        """Presence lookup polled inside chromedriver rather than from Python. Elements already present cost one call."""
         timeout = timeout or self.delays['element_wait']
-        try: return WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((by, selector)))
-        except TimeoutException: self.logger.debug(f"Timeout: Elem {by}='{selector}'"); return None
+        try: return self.driver.find_element(by, selector)
+        except NoSuchElementException: pass
+        try:
+            with self.implicit_wait(timeout): return self.driver.find_element(by, selector)
+        except NoSuchElementException: self.logger.debug("Timeout: Elem %s='%s'", by, selector); return None
 
-    def wait_for_clickable(self, selector, by=By.CSS_SELECTOR, timeout=None):
-        timeout = timeout or self.delays['element_wait']
-        try: return WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable((by, selector)))
-        except TimeoutException: self.logger.debug(f"Timeout: Clickable {by}='{selector}'"); return None
+    def wait_for_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
+        return self.find_one(selector, by=by, timeout=timeout)
 
     def click_element_safely(self, element):
         try: element.click(); return True
         except ElementClickInterceptedException:
-            self.logger.warning("Click intercepted, JS fallback.");tl=0.1
-            try:self.driver.execute_script("arguments[0].scrollIntoView(true);",element);time.sleep(tl);self.driver.execute_script("arguments[0].click();",element);return True
+            self.logger.warning("Click intercepted, JS fallback.")
+            # Scroll and click in one script; the scroll is synchronous so no settle sleep is needed.
+            js_scroll_click = "const e=arguments[0];if(e.scrollIntoViewIfNeeded)e.scrollIntoViewIfNeeded();else e.scrollIntoView({block:'center'});e.click();"
+            try:self.driver.execute_script(js_scroll_click,element);return True
             except Exception as e: self.logger.error(f"JS click fail: {e}"); return False
+        except StaleElementReferenceException: raise # let click_cached refresh its handle
         except Exception as e: self.logger.error(f"Other click error: {e}"); return False
 
+    def _find_first(self, css_list: List[str], xpath_list: List[str] = ()):
+        """Returns the first element matching any CSS selector, then any XPath, in one round-trip (or None)."""
+        js_find_first = """
+            const cs=arguments[0], xs=arguments[1];
+            for(const s of cs){const e=document.querySelector(s); if(e) return e;}
+            for(const x of xs){const r=document.evaluate(x,document,null,XPathResult.FIRST_ORDERED_NODE_TYPE,null).singleNodeValue; if(r) return r;}
+            return null;"""
+        return self.driver.execute_script(js_find_first, list(css_list), list(xpath_list))
+
+    def click_cached(self, key: str, css_list: List[str], xpath_list: List[str] = (), timeout=None) -> bool:
+        """
+        Clicks the element for `key`, reusing the handle found on an earlier call. The editor's tabs and buttons
+        are static DOM, so the lookup normally happens once per run; a stale handle triggers one fresh lookup.
+        """
+        element = self._element_cache.get(key)
+        if element is not None:
+            try:
+                if self.click_element_safely(element): return True
+            except StaleElementReferenceException: self.logger.debug("Cached element '%s' went stale; looking it up again.", key)
+            self._element_cache.pop(key, None)
+        element = self.wait_for_first(css_list, xpath_list, timeout=timeout)
+        if element is None: return False
+        try: clicked = self.click_element_safely(element)
+        except StaleElementReferenceException: return False
+        if clicked: self._element_cache[key] = element
+        return clicked
+
+    def wait_for_first(self, css_list: List[str], xpath_list: List[str] = (), timeout=None):
+        """Polls _find_first under a single explicit wait instead of one WebDriverWait per selector."""
+        timeout = timeout or self.delays['element_wait']
+        try: return WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(lambda d: self._find_first(css_list, xpath_list))
+        except TimeoutException: self.logger.debug("Timeout: none of %d CSS / %d XPath candidates found", len(css_list), len(xpath_list)); return None
+
+    def wait_for_idle(self, idle_ms: int = 150, timeout: Optional[float] = None) -> bool:
+        """Waits until no tracked request is in flight and no request finished (or canvas draw happened) in the last idle_ms, capped at timeout."""
+        timeout = self.delays['element_wait'] if timeout is None else timeout
+        idle_ms = min(idle_ms, int(timeout * 1000))
+        try: result = self.call_js_helper("window.__cc.idle(%d, %d)" % (idle_ms, int(timeout * 1000)), await_promise=True)
+        except Exception as e: self.logger.debug("wait_for_idle failed (%s); sleeping %ss.", e, timeout); time.sleep(timeout); return False
+        if result == 'missing' or result is None: self.logger.debug("Network tracker missing; sleeping %ss.", timeout); time.sleep(timeout); return False
+        if not result: self.logger.debug("Network not idle within %ss.", timeout)
+        return bool(result)
+
+    def wait_for_js_condition(self, script: str, timeout: float, *args) -> bool:
+        """Polls a JS expression (script must `return` it) until truthy; replaces fixed post-action sleeps."""
+        try: WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(lambda d: d.execute_script(script, *args)); return True
+        except TimeoutException: self.logger.debug("Timeout (%ss) waiting for JS condition.", timeout); return False
+        except Exception as e: self.logger.debug("Error polling JS condition: %s", e); return False
+
+    def wait_between_canvas_polls(self, poll_started: float, interval: float, changed: bool, deadline: float):
+        """Replaces the fixed sleep between canvas polls with one awaited window.__cc.pollWait on the page's draw marker.
+
+        Before the canvas has changed, wakes as soon as the page draws again (at most `interval` after the
+        last poll). Afterwards, waits for `interval` and then until nothing was drawn for `interval`, so
+        half-rendered frames aren't hashed only to reset the stability count.
+        """
+        now = time.perf_counter()
+        if deadline <= now: return
+        args = (int((now - poll_started) * 1000), json.dumps(changed), int(interval * 1000), int((deadline - now) * 1000))
+        try: waited = self.call_js_helper("window.__cc.pollWait(%d, %s, %d, %d)" % args, await_promise=True)
+        except Exception as e: waited = None; self.logger.debug("Draw marker wait failed: %s", e)
+        if waited is not True:
+            # No marker to wait on: sleep out the rest of the interval, as before the marker existed.
+            time.sleep(max(0.0, min(poll_started + interval, deadline) - time.perf_counter()))
+
+    def install_js_helpers(self):
+        """Defines window.__cc on the current page and registers it for any future document loads."""
+        try:
+            self.driver.execute_script(CC_JS_HELPERS)
+            if hasattr(self.driver, 'execute_cdp_cmd') and not self._js_helpers_script_id:
+                res = self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': CC_JS_HELPERS})
+                self._js_helpers_script_id = (res or {}).get('identifier') or 'registered'
+            self.logger.debug("Installed page JS helpers (window.__cc).")
+        except Exception as e: self.logger.warning(f"Could not install page JS helpers: {e}")
+
+    def call_js_helper(self, expression: str, await_promise: bool = False):
+        """Evaluates an expression against window.__cc, reinstalling the helpers once if the page lost them."""
+        script = f"return window.__cc ? {expression} : '__cc_missing__';"
+        result = self.evaluate_js(script, await_promise)
+        if result == '__cc_missing__':
+            self.logger.debug("Page JS helpers missing; reinstalling."); self.install_js_helpers()
+            result = self.evaluate_js(script, await_promise)
+            if result == '__cc_missing__': self.logger.error("Page JS helpers unavailable after reinstall."); return None
+        return result
+
+    # Whether a tab's panel (#creator-menu-<name>) is shown; null when the page has no such panel.
+    JS_TAB_SHOWN_FN = "(name) => { const m = document.getElementById('creator-menu-' + name); return m ? !m.classList.contains('hidden') : null; }"
+
     def _navigate_to_creator_tab(self, target_tab_name: str) -> bool:
         if self._current_active_tab == target_tab_name:
-            self.logger.debug(f"Already on '{target_tab_name}' tab.")
+            self.logger.debug("Already on '%s' tab.", target_tab_name)
             return True
-        self.logger.info(f"Navigating to '{target_tab_name}' tab...")
+        self.logger.debug("Navigating to '%s' tab...", target_tab_name)
         tab_selector = f"h3[onclick*='toggleCreatorTabs(event, \"{target_tab_name}\")']"
-        tab_button = self.wait_for_clickable(tab_selector, timeout=3)
-        if tab_button and self.click_element_safely(tab_button):
-            self.logger.info(f"Clicked '{target_tab_name}' tab.")
+        # Tolerate markup variations (quote style, element type) without a wait per selector. The attribute
+        # filters run in the browser's native querySelector, so no '//*[@onclick]' style XPath scan is needed.
+        tab_css = [tab_selector, f"h3[onclick*=\"toggleCreatorTabs(event, '{target_tab_name}')\"]",
+                   f"[onclick*='toggleCreatorTabs'][onclick*='\"{target_tab_name}\"']", f"[onclick*='toggleCreatorTabs'][onclick*=\"'{target_tab_name}'\"]"]
+        js_tab_shown = f"return ({self.JS_TAB_SHOWN_FN})(arguments[0]);"
+        cache_key = f"tab:{target_tab_name}"; clicked, shown = False, None
+        cached = self._element_cache.get(cache_key)
+        if cached is not None:
+            # Known tab: click it and read its panel state in one script instead of a click plus a separate check.
+            try: shown = self.driver.execute_script(f"arguments[0].click(); return ({self.JS_TAB_SHOWN_FN})(arguments[1]);", cached, target_tab_name); clicked = True
+            except StaleElementReferenceException: self.logger.debug("Cached '%s' tab went stale; looking it up again.", target_tab_name); self._element_cache.pop(cache_key, None)
+            except Exception as e:
+                self.logger.debug("Scripted '%s' tab click failed (%s); using a regular click.", target_tab_name, e)
+                try: clicked = self.click_element_safely(cached)
+                except StaleElementReferenceException: clicked = False
+                if not clicked: self._element_cache.pop(cache_key, None)
+                else: shown = self.driver.execute_script(js_tab_shown, target_tab_name)
+        if clicked or self.click_cached(cache_key, tab_css, timeout=3):
+            self.logger.debug("Clicked '%s' tab.", target_tab_name)
             self._current_active_tab = target_tab_name
-            time.sleep(self.delays['tab_switch'] + 0.3) 
+            # Wait for the tab's panel to be shown instead of a fixed delay; pages without the panel id fall back to the delay.
+            if not clicked: shown = self.driver.execute_script(js_tab_shown, target_tab_name)
+            if shown is None: time.sleep(self.delays['tab_switch'])
+            elif not shown: self.wait_for_js_condition(js_tab_shown, self.delays['tab_switch'] + 0.3, target_tab_name)
             return True
         self.logger.error(f"'{target_tab_name}' tab button ({tab_selector}) not found/clickable."); self._current_active_tab=None; return False
 
+    PAGE_API_FUNCTIONS = ('loadCard', 'toggleCreatorTabs', 'uploadSavedCards', 'autoFitArt', 'resetSetSymbol')
+
+    def probe_page_api(self) -> Dict[str, bool]:
+        """Checks which Card Conjurer globals exist with one script and caches the result in self._page_api."""
+        js_probe = "const r={};for(const n of arguments[0])r[n]=typeof window[n]==='function';return r;"
+        try: self._page_api = self.driver.execute_script(js_probe, list(self.PAGE_API_FUNCTIONS)) or {}
+        except Exception as e: self.logger.debug("Page API probe failed: %s", e); self._page_api = {}
+        missing = [n for n in self.PAGE_API_FUNCTIONS if not self._page_api.get(n)]
+        if missing: self.logger.info(f"Card Conjurer functions not found on page: {', '.join(missing)}")
+        return self._page_api
+
     def navigate_to_card_conjurer(self):
-        self.logger.info(f"Navigating to: {self.url}"); self.driver.get(self.url)
+        self.logger.info(f"Navigating to: {self.url}"); self.driver.get(self.url); self._element_cache.clear(); self._button_fallbacks.clear()
         if self.wait_for_element("canvas",timeout=10):
-            self.logger.info("Canvas found, page ready."); self._current_active_tab="art"; return True 
+            self.logger.info("Canvas found, page ready."); self._current_active_tab="art"; self.install_js_helpers(); self.probe_page_api(); return True 
         self.logger.error("Canvas not found."); return False
 
     # --- MODIFIED: Now also stores the full original card list ---
@@ -253,6 +835,11 @@ class CardConjurerDownloader:
             self.logger.error(f"Error reading/parsing {file_path}: {e}", exc_info=True); return False
 
     # ... (upload_cardconjurer_file to _generate_filename are unchanged) ...
+    FILE_INPUT_SELECTORS = [
+        "input#importProject[type='file']", "input[type='file'][accept*='.cardconjurer']",
+        "input[type='file'][oninput*='uploadSavedCards']", "input[type='file']",
+    ]
+
     def upload_cardconjurer_file(self, file_path: str) -> bool:
         self.logger.info(f"Starting file upload process for: {file_path}")
         if not os.path.exists(file_path): 
@@ -261,93 +848,138 @@ class CardConjurerDownloader:
             self.logger.error("Upload: Navigation to import tab failed before sending keys."); return False
 
         self.logger.info("Attempting to find the file input element on the import tab...")
-        file_input_selectors = [
-            "input#importProject[type='file']", "input[type='file'][accept*='.cardconjurer']", 
-            "input[type='file'][oninput*='uploadSavedCards']", "input[type='file']", 
-        ]
-        file_input_element = None; found_specific_visible = False
-        for pass_type in ["VISIBLE", "HIDDEN"]: 
-            candidate_el_for_pass = None 
-            for selector in file_input_selectors:
-                self.logger.debug(f"Trying {pass_type} file input selector: {selector}")
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for el in elements:
-                        is_el_displayed = el.is_displayed()
-                        if (pass_type == "VISIBLE" and not is_el_displayed) or \
-                           (pass_type == "HIDDEN" and is_el_displayed and file_input_element and file_input_element.is_displayed()): 
-                            continue
-                        el_accept = el.get_attribute('accept') or ""; el_oninput = el.get_attribute('oninput') or ""
-                        is_specific = ('.cardconjurer' in el_accept or '.txt' in el_accept) or ('uploadSavedCards' in el_oninput)
-                        if is_el_displayed:
-                            if is_specific: candidate_el_for_pass = el; found_specific_visible = True; break 
-                            elif not candidate_el_for_pass: candidate_el_for_pass = el 
-                        elif pass_type == "HIDDEN" and not found_specific_visible: 
-                            if is_specific: 
-                                if not candidate_el_for_pass or not ((candidate_el_for_pass.get_attribute('accept') or "").startswith('.')): 
-                                     candidate_el_for_pass = el
-                            elif not candidate_el_for_pass : candidate_el_for_pass = el 
-                except Exception as e_find: self.logger.debug(f"Error finding {pass_type} selector {selector}: {e_find}")
-                if candidate_el_for_pass and is_specific and (candidate_el_for_pass.is_displayed() if pass_type == "VISIBLE" else True): break 
-            if candidate_el_for_pass: file_input_element = candidate_el_for_pass
-            if found_specific_visible: break 
-            if file_input_element and file_input_element.is_displayed() and not is_specific and pass_type == "VISIBLE": break 
-
-        if not file_input_element:
+        # Single in-page search with the same priority the old two-pass loop used:
+        # visible+specific, then visible near an upload/import label, then any visible, then the same for hidden.
+        # Labels are matched on parentElement.textContent, which (unlike .text/innerText) needs no layout.
+        js_find_file_input = """
+            const sels=arguments[0];
+            const isSpecific=e=>/\\.cardconjurer|\\.txt/.test(e.getAttribute('accept')||'')||/uploadSavedCards/.test(e.getAttribute('oninput')||'');
+            const kw=/upload|import|load|choose file/i, nearKw=e=>!!e.parentElement&&kw.test(e.parentElement.textContent||'');
+            const isVisible=e=>!!(e.offsetWidth||e.offsetHeight||e.getClientRects().length);
+            const all=[]; for(const s of sels){for(const e of document.querySelectorAll(s)){if(!all.includes(e))all.push(e);}}
+            const el=all.find(e=>isVisible(e)&&isSpecific(e))||all.find(e=>isVisible(e)&&nearKw(e))||all.find(isVisible)
+                   ||all.find(isSpecific)||all.find(nearKw)||all[0];
+            return el?{el:el, visible:isVisible(el)}:null;"""
+        try: found = self.driver.execute_script(js_find_file_input, self.FILE_INPUT_SELECTORS)
+        except Exception as e_find: self.logger.debug("Error searching for file input: %s", e_find); found = None
+
+        if not found:
             self.logger.error("Could not find a suitable file input element on the import tab."); return False
-        if not file_input_element.is_displayed():
+        file_input_element = found['el']
+        if not found['visible']:
              self.logger.warning(f"Using a HIDDEN file input element. Attempting to make it visible for interaction.")
         try:
             self.logger.info(f"Using file input: Tag={file_input_element.tag_name}, ID='{file_input_element.get_attribute('id')}', Class='{file_input_element.get_attribute('class')}'")
             self.driver.execute_script("arguments[0].style.opacity=1;arguments[0].style.display='block';arguments[0].style.visibility='visible';arguments[0].disabled=false;arguments[0].removeAttribute('hidden');", file_input_element)
-            time.sleep(0.2); file_input_element.send_keys(os.path.abspath(file_path)); self.logger.info(f"File path sent.")
+            file_input_element.send_keys(os.path.abspath(file_path)); self.logger.info(f"File path sent.")
         except Exception as e: self.logger.error(f"Error sending file path: {e}", exc_info=True); return False
         
         self.logger.info("Waiting for cards to load from file...")
         try:
-            WebDriverWait(self.driver, self.delays['file_upload_wait']).until(self.check_cards_loaded) 
+            # Cards from earlier files/runs may already be listed; then wait for this file's keys specifically.
+            expected_keys = set(self.parsed_card_data_map) if self._reuses_saved_cards() and self.parsed_card_data_map else None
+            loaded = self.wait_for_cards_loaded(self.delays['file_upload_wait'], expected_keys)
+            if loaded is False: raise TimeoutException()
+            if loaded is None:
+                # Poll every 50 ms (default is 500 ms); check_cards_loaded is a single cheap script.
+                upload_done = self.check_cards_loaded
+                if expected_keys: upload_done = lambda d: self.check_cards_loaded(d) and expected_keys <= {v.strip() for _, v in self._card_option_snapshot}
+                WebDriverWait(self.driver, self.delays['file_upload_wait'], poll_frequency=0.05).until(upload_done)
             self.logger.info("Cards loaded successfully after file upload.")
             self._current_active_tab = "import" 
             return True
         except TimeoutException: 
             self.logger.error("Timeout waiting for cards to load after file upload.")
             try:
-                card_select_dbg = self.driver.find_element(By.ID, "load-card-options")
-                options_dbg = card_select_dbg.find_elements(By.TAG_NAME, "option")
-                valid_options_dbg = [opt.text for opt in options_dbg if opt.text.strip() and opt.text.strip().lower() not in ['none selected', 'load a saved card', '']]
+                rows_dbg = self._card_option_rows()
+                if rows_dbg is None: raise NoSuchElementException("load-card-options")
+                valid_options_dbg = [t.strip() for t, _ in rows_dbg if t.strip().lower() not in self._PLACEHOLDER_OPTIONS]
                 self.logger.info(f"Debug: Found {len(valid_options_dbg)} cards in dropdown during fail: {valid_options_dbg[:5]}")
             except: self.logger.info("Debug: Could not get card options for debugging during fail.")
             try:
-                if self.driver.execute_script("return typeof uploadSavedCards === 'function';"):
+                if self.probe_page_api().get('uploadSavedCards'):
                     self.logger.info("'uploadSavedCards' function EXISTS. Failure might be due to event not triggering.")
                 else: self.logger.info("'uploadSavedCards' function does NOT exist.") 
             except Exception as e_js: self.logger.warning(f"Error checking for 'uploadSavedCards' JS function: {e_js}")
             return False
 
+    _PLACEHOLDER_OPTIONS = ('none selected', 'load a saved card', '')
+
     def check_cards_loaded(self, driver_instance=None) -> bool:
         driver_to_use = driver_instance if driver_instance else self.driver
+        # One round-trip instead of find_element + find_elements + .text per option. Once cards are present the
+        # same call returns the whole [text, value] snapshot, which get_saved_cards then reuses.
+        js_any_card_loaded = """
+            const s=document.getElementById('load-card-options'); if(!s)return null;
+            const skip=arguments[0], opts=Array.from(s.options);
+            return opts.some(o=>!skip.includes(o.text.trim().toLowerCase()))?opts.map(o=>[o.text,o.value]):false;"""
         try:
-            card_select = driver_to_use.find_element(By.ID, "load-card-options")
-            options = card_select.find_elements(By.TAG_NAME, "option")
-            return any(opt.text.strip() and opt.text.strip().lower() not in ['none selected', 'load a saved card', ''] for opt in options)
-        except NoSuchElementException: self.logger.debug("check_cards_loaded: 'load-card-options' not found."); return False
-        except Exception as e: self.logger.debug(f"check_cards_loaded: Error: {e}"); return False
+            loaded = driver_to_use.execute_script(js_any_card_loaded, list(self._PLACEHOLDER_OPTIONS))
+            if loaded is None: self.logger.debug("check_cards_loaded: 'load-card-options' not found."); return False
+            if loaded: self._card_option_snapshot = loaded
+            return bool(loaded)
+        except Exception as e: self.logger.debug("check_cards_loaded: Error: %s", e); return False
         
+    def wait_for_cards_loaded(self, timeout: float, expected_keys=None) -> Optional[bool]:
+        """
+        Waits for the saved-card dropdown to list cards (all of expected_keys, if given) with a MutationObserver,
+        so the import is noticed on the mutation itself. Stores the [text, value] snapshot like check_cards_loaded.
+        Returns True/False, or None if the async script could not run (callers then poll instead).
+        """
+        js_wait_cards = """
+            const skip=arguments[0], expected=arguments[1], timeoutMs=arguments[2], cb=arguments[arguments.length-1];
+            let obs=null, timer=null;
+            const snapshot=()=>{const s=document.getElementById('load-card-options'); if(!s)return null;
+                const opts=Array.from(s.options); if(!opts.some(o=>!skip.includes(o.text.trim().toLowerCase())))return null;
+                if(expected){const have=new Set(opts.map(o=>o.value.trim())); if(!expected.every(k=>have.has(k)))return null;}
+                return opts.map(o=>[o.text,o.value]);};
+            const check=()=>{const snap=snapshot(); if(!snap)return false; if(obs)obs.disconnect(); clearTimeout(timer); cb(snap); return true;};
+            if(check())return;
+            // The import may rebuild the select itself, so watch the whole document rather than the element.
+            obs=new MutationObserver(check); obs.observe(document.body,{childList:true,subtree:true});
+            timer=setTimeout(()=>{obs.disconnect(); cb(false);}, timeoutMs);"""
+        try:
+            self.driver.set_script_timeout(max(30, timeout + 5)) # never below Selenium's 30 s default
+            snapshot = self.driver.execute_async_script(js_wait_cards, list(self._PLACEHOLDER_OPTIONS),
+                                                        sorted(expected_keys) if expected_keys else None, int(timeout * 1000))
+        except Exception as e: self.logger.debug("Card-list observer failed (%s); polling instead.", e); return None
+        if snapshot: self._card_option_snapshot = snapshot
+        return bool(snapshot)
+
+    def _card_option_rows(self) -> Optional[List[List[str]]]:
+        """Snapshot of the saved-card dropdown as [text, value] pairs in one round-trip; None if it is missing."""
+        return self.driver.execute_script("const s=document.getElementById('load-card-options');return s?Array.from(s.options).map(o=>[o.text,o.value]):null;")
+
+    def _reuses_saved_cards(self) -> bool:
+        """True when the page's saved cards may include ones from earlier files or runs (shared session/profile)."""
+        return bool(self.attach_to_chrome or self.chrome_user_data_dir or self._files_processed > 1)
+
     def get_saved_cards(self) -> list:
         self.logger.info("Getting list of saved cards...")
         self.cards = [] 
         if not self._navigate_to_creator_tab("import"):
             self.logger.error("Cannot navigate to 'import' tab for get_saved_cards."); return []
         try:
-            card_select = self.wait_for_element("load-card-options", by=By.ID, timeout=5)
-            if not card_select: self.logger.error("'load-card-options' select element not found."); return []
-            options = card_select.find_elements(By.TAG_NAME, "option")
+            # Reuse the snapshot taken when the upload was confirmed; the dropdown doesn't change after that.
+            rows, self._card_option_snapshot = self._card_option_snapshot, None
+            if rows is None:
+                card_select = self.wait_for_element("load-card-options", by=By.ID, timeout=5)
+                if not card_select: self.logger.error("'load-card-options' select element not found."); return []
+                rows = self._card_option_rows() or []
             # The 'value' attribute of the options is what load_card uses.
-            cards_found = [opt.get_attribute("value").strip() for opt in options if opt.get_attribute("value").strip() and opt.get_attribute("value").strip().lower() not in ['none selected', 'load a saved card', '']]
+            cards_found = [v.strip() for _, v in rows if v.strip().lower() not in self._PLACEHOLDER_OPTIONS]
             self.logger.info(f"Found {len(cards_found)} saved cards (dropdown values): {cards_found[:5] if cards_found else 'None'}") 
+            if self._reuses_saved_cards() and self.parsed_card_data_map:
+                # A reused profile or session keeps cards saved by earlier files in localStorage; only process this file's cards.
+                stale = [c for c in cards_found if c not in self.parsed_card_data_map]
+                if stale: self.logger.info(f"Ignoring {len(stale)} saved card(s) from earlier files/runs that are not in the input file.")
+                cards_found = [c for c in cards_found if c in self.parsed_card_data_map]
             self.cards = cards_found; return cards_found
         except Exception as e: self.logger.error(f"Error getting saved cards: {e}", exc_info=True); return []
 
+    # --frame choices -> autoFrame <select> values.
+    FRAME_MAPPING = {'7th': 'Seventh', 'seventh': 'Seventh', '8th': 'Eighth', 'eighth': 'Eighth', 'm15': 'M15Eighth', 'ub': 'M15EighthUB'}
+
     def set_auto_frame(self, frame_option: str) -> bool:
         if not frame_option: return True 
         self.logger.info(f"Setting auto frame to: {frame_option}")
@@ -355,39 +987,57 @@ class CardConjurerDownloader:
             self.logger.debug("Ensuring 'art' tab is active for set_auto_frame.")
             if not self._navigate_to_creator_tab("art"):
                  self.logger.warning("Cannot navigate to 'art' for set_auto_frame. It might fail.")
-        frame_mapping = {'7th': 'Seventh', 'seventh': 'Seventh', '8th': 'Eighth', 'eighth': 'Eighth', 'm15': 'M15Eighth', 'ub': 'M15EighthUB'}
-        dropdown_value = frame_mapping.get(frame_option.lower())
+        dropdown_value = self.FRAME_MAPPING.get(frame_option.lower())
         if not dropdown_value: self.logger.error(f"Invalid frame option: {frame_option}."); return False
+        # Set, dispatch 'change' and read back the value in one round-trip (Select() costs several per call).
+        js_set_frame = """
+            const s=document.getElementById('autoFrame'); if(!s) return null;
+            s.value=arguments[0]; s.dispatchEvent(new Event('change',{bubbles:true})); return s.value;"""
         try:
-            self.logger.debug(f"Attempting to set auto frame to '{dropdown_value}' using Selenium Select.")
-            select_element = self.wait_for_element("autoFrame", by=By.ID, timeout=5)
-            if not select_element: self.logger.error("autoFrame select not found."); return False
-            Select(select_element).select_by_value(dropdown_value)
-            self.logger.info(f"Set auto frame to '{dropdown_value}' via Select."); time.sleep(self.delays['frame_set'] + 0.5); return True
-        except Exception as e: 
-            self.logger.warning(f"Select for auto frame failed: {e}. Trying JS.");
-            try:
-                self.driver.execute_script(f"var s=document.getElementById('autoFrame');s.value='{dropdown_value}';s.dispatchEvent(new Event('change',{{'bubbles':true}}));")
-                self.logger.info(f"Set auto frame to '{dropdown_value}' via JS."); time.sleep(self.delays['frame_set'] + 0.5); return True
-            except Exception as e_js: self.logger.error(f"JS for auto frame failed: {e_js}"); return False
+            actual = self.driver.execute_script(js_set_frame, dropdown_value)
+            if actual is None:
+                if not self.wait_for_element("autoFrame", by=By.ID, timeout=5): self.logger.error("autoFrame select not found."); return False
+                actual = self.driver.execute_script(js_set_frame, dropdown_value)
+        except Exception as e_js: self.logger.error(f"JS for auto frame failed: {e_js}"); return False
+        if actual != dropdown_value:
+            self.logger.error(f"autoFrame has no option '{dropdown_value}' (value is now '{actual}')."); return False
+        self.logger.info(f"Set auto frame to '{dropdown_value}'.")
+        self.wait_for_idle(timeout=self.delays['frame_set'] + 0.5); return True
+
+    # Constant source for every card: the card name and barrier cap are script arguments, never interpolated.
+    JS_LOAD_CARD = """
+        const done=arguments[arguments.length-1];
+        if(!window.__cc){done('__cc_missing__');return;}
+        try{Promise.resolve(window.__cc.load(arguments[0], arguments[1])).then(done, e=>done({error:String(e)}));}
+        catch(e){done({error:String(e)});}"""
 
     def load_card(self, card_name: str) -> bool:
-        self.logger.info(f"Loading card: '{card_name}' using JavaScript method.")
-        # Assumes 'import' tab is active.
+        self.logger.debug("Loading card: '%s' using JavaScript method.", card_name)
+        # Works from any tab: the <select> stays in the DOM while the import panel is hidden.
         try:
-            card_select_el = self.wait_for_element("load-card-options", By.ID, timeout=3)
-            if not card_select_el: self.logger.error("'load-card-options' not found."); return False
-            js_card = json.dumps(card_name) # card_name is from option.value, should be safe
-            t=time.perf_counter(); self.driver.execute_script(f"document.getElementById('load-card-options').value = {js_card};"); self.logger.debug(f"JS: Set value took {time.perf_counter() - t:.4f}s")
-            t=time.perf_counter(); self.driver.execute_script(f"var s=document.getElementById('load-card-options'); s.dispatchEvent(new Event('change',{{'bubbles':true}}));"); dur=time.perf_counter()-t; self.logger.debug(f"JS: Dispatch 'change' took {dur:.4f}s")
-            if dur < 1.0 and self.driver.execute_script("return typeof loadCard === 'function';"):
-                t=time.perf_counter(); self.driver.execute_script(f"loadCard({js_card});"); self.logger.debug(f"JS: Global loadCard() call took {time.perf_counter() - t:.4f}s")
-            elif dur >= 1.0 : self.logger.info(f"JS: Dispatch 'change' was slow ({dur:.4f}s), assumed load handled.")
-            time.sleep(self.delays['card_load_js_ops']); self.logger.info(f"JS operations for card load '{card_name}' completed."); return True
+            # window.__cc.load sets the value, dispatches 'change' and calls the global loadCard() in one round-trip.
+            # It resolves once the card has painted, so callers start from a drawn card rather than a fixed delay.
+            t=time.perf_counter(); cap_ms = int(self.delays['card_load_barrier'] * 1000)
+            res = self.driver.execute_async_script(self.JS_LOAD_CARD, card_name, cap_ms)
+            if res == '__cc_missing__':
+                self.logger.debug("Page JS helpers missing; reinstalling."); self.install_js_helpers()
+                res = self.driver.execute_async_script(self.JS_LOAD_CARD, card_name, cap_ms)
+            if res == '__cc_missing__': self.logger.error("Page JS helpers unavailable after reinstall."); return False
+            if res is None: self.logger.error("'load-card-options' not found."); return False
+            if res.get('error'): self.logger.error(f"Error loading card '{card_name}': the load script threw {res['error']}"); return False
+            self.logger.debug("JS: Load script took %.4fs (dispatch 'change' %.4fs, loadCard() called: %s, painted after %.4fs%s)", time.perf_counter() - t,
+                              res.get('dispatchMs', 0)/1000, res.get('called'), res.get('readyMs', 0)/1000, ", barrier timed out" if res.get('timedOut') else "")
+            if not res.get('called') and res.get('dispatchMs', 0) >= 1000: self.logger.info(f"JS: Dispatch 'change' was slow ({res['dispatchMs']/1000:.4f}s), assumed load handled.")
+            self.logger.debug("JS operations for card load '%s' completed.", card_name); return True
         except Exception as e: self.logger.error(f"Error loading card '{card_name}': {e}", exc_info=True); return False
 
     def get_live_rarity_from_page(self) -> Optional[str]:
-        self.logger.info("Attempting to get live rarity from 'Collector' tab...")
+        """Reads the Collector tab's rarity input. Hidden tab panels stay in the DOM, so normally no tab switch is needed."""
+        try: live_rarity_value = self.driver.execute_script("const e=document.querySelector('input#info-rarity');return e?e.value:null;")
+        except Exception as e: self.logger.debug("Direct rarity read failed: %s", e); live_rarity_value = None
+        if live_rarity_value is not None:
+            self.logger.debug("Read live rarity value '%s' without switching tabs.", live_rarity_value); return live_rarity_value
+        self.logger.info("Rarity input not in the DOM; trying the 'Collector' tab...")
         if not self._navigate_to_creator_tab("bottomInfo"): 
             self.logger.error("Failed to navigate to 'Collector' (bottomInfo) tab to get rarity."); return None
         rarity_input_selector = "input#info-rarity"
@@ -399,76 +1049,136 @@ class CardConjurerDownloader:
             except Exception as e: self.logger.error(f"Error getting value from rarity input ({rarity_input_selector}): {e}"); return None
         self.logger.error(f"Rarity input field ('{rarity_input_selector}') not found on 'Collector' tab."); return None
 
+    # (css list, xpath list) candidates for the feature buttons, probed in one call by _find_first.
+    AUTO_FIT_ART_SELECTORS = (["button.input[onclick='autoFitArt();']", "[onclick*='autoFitArt']"], ["//button[normalize-space()='Auto Fit Art']"])
+    RESET_SET_SYMBOL_SELECTORS = (["button.input[onclick='resetSetSymbol();']", "[onclick*='resetSetSymbol']"], ["//button[normalize-space()='Reset Set Symbol']"])
+
+    def _trigger_page_button(self, label: str, selectors: Tuple[List[str], List[str]], js_function: str, wait_key: str) -> bool:
+        """
+        Clicks a feature button; if none is found/clickable, calls the page function the button would have called.
+        Once the button lookup has failed, later cards go straight to the function call instead of waiting it out again.
+        """
+        if not self._button_fallbacks.get(js_function) and self.click_cached(f"button:{js_function}", *selectors, timeout=3):
+            self.logger.debug("Clicked '%s' button.", label)
+        else:
+            js_call = "const f=window[arguments[0]];if(typeof f!=='function')return false;f();return true;"
+            try: called = self.driver.execute_script(js_call, js_function)
+            except Exception as e: self.logger.error(f"Calling {js_function}() failed: {e}"); return False
+            if not called: self.logger.error(f"'{label}' button not found/clickable and {js_function}() is not defined."); return False
+            if not self._button_fallbacks.get(js_function):
+                self.logger.info(f"'{label}' button not found/clickable; calling {js_function}() directly from now on.")
+                self._button_fallbacks[js_function] = True
+        self.wait_for_idle(timeout=self.delays[wait_key]); return True
+
     def apply_auto_fit_art(self) -> bool:
-        self.logger.info("Applying Auto Fit Art...")
+        self.logger.debug("Applying Auto Fit Art...")
         if not self._navigate_to_creator_tab("art"): return False
-        button_selector = "button.input[onclick='autoFitArt();']"; auto_fit_button = self.wait_for_clickable(button_selector, timeout=3)
-        if auto_fit_button and self.click_element_safely(auto_fit_button):
-            self.logger.info("Clicked 'Auto Fit Art' button."); time.sleep(self.delays['art_fit_wait']); return True
-        self.logger.error(f"'Auto Fit Art' button ({button_selector}) not found/clickable."); return False
+        return self._trigger_page_button("Auto Fit Art", self.AUTO_FIT_ART_SELECTORS, 'autoFitArt', 'art_fit_wait')
 
     def apply_auto_fit_set_symbol(self) -> bool:
-        self.logger.info("Applying Reset Set Symbol (Auto Fit)...")
+        self.logger.debug("Applying Reset Set Symbol (Auto Fit)...")
         if not self._navigate_to_creator_tab("setSymbol"): return False
-        button_selector = "button.input[onclick='resetSetSymbol();']"; reset_button = self.wait_for_clickable(button_selector, timeout=3)
-        if reset_button and self.click_element_safely(reset_button):
-            self.logger.info("Clicked 'Reset Set Symbol' button."); time.sleep(self.delays['set_symbol_reset_wait']); return True
-        self.logger.error(f"'Reset Set Symbol' button ({button_selector}) not found/clickable."); return False
+        return self._trigger_page_button("Reset Set Symbol", self.RESET_SET_SYMBOL_SELECTORS, 'resetSetSymbol', 'set_symbol_reset_wait')
 
     def apply_set_symbol_override(self, base_set_code: str) -> bool:
-        self.logger.info(f"Applying Set Symbol Override for code: '{base_set_code}' (will use live rarity).")
-        live_rarity = self.get_live_rarity_from_page() # Navigates to 'bottomInfo'
+        self.logger.debug("Applying Set Symbol Override for code: '%s' (will use live rarity).", base_set_code)
+        live_rarity = self.get_live_rarity_from_page() # Reads input#info-rarity; no tab switch normally
         target_rarity_val = None
-        if live_rarity is not None and live_rarity.strip(): target_rarity_val = live_rarity.strip().upper(); self.logger.info(f"Using live rarity '{target_rarity_val}'.")
+        if live_rarity is not None and live_rarity.strip(): target_rarity_val = live_rarity.strip().upper(); self.logger.debug("Using live rarity '%s'.", target_rarity_val)
         elif live_rarity == "": self.logger.warning("Live rarity empty; rarity field not explicitly set.")
         else: self.logger.warning("Could not get live rarity; rarity field not explicitly set.")
         
         if not self._navigate_to_creator_tab("setSymbol"): self.logger.error("Failed nav to 'Set Symbol' for override."); return False
         
-        code_input_el = self.wait_for_element("input#set-symbol-code", timeout=3)
-        if not code_input_el: self.logger.error("Set code input ('input#set-symbol-code') not found."); return False
-        try:
-            self.click_element_safely(code_input_el); code_input_el.clear(); code_input_el.send_keys(base_set_code)
-            self.logger.info(f"Set 'set-symbol-code' to '{base_set_code}'.")
-            self.driver.execute_script("arguments[0].dispatchEvent(new Event('change',{bubbles:true}));", code_input_el)
+        # Both fields are set in one script (value + input/change events) rather than clear() and typed send_keys().
+        js_set_inputs = """
+            const set=(id,v)=>{const e=document.querySelector('input#'+id); if(!e)return false; e.value=v;
+                e.dispatchEvent(new Event('input',{bubbles:true})); e.dispatchEvent(new Event('change',{bubbles:true})); return true;};
+            return {code:set('set-symbol-code',arguments[0]), rarity:arguments[1]===null?null:set('set-symbol-rarity',arguments[1])};"""
+        if not self.wait_for_element("input#set-symbol-code", timeout=3): self.logger.error("Set code input ('input#set-symbol-code') not found."); return False
+        try: res = self.driver.execute_script(js_set_inputs, base_set_code, target_rarity_val or None)
         except Exception as e: self.logger.error(f"Error with set code input: {e}"); return False
+        if not res.get('code'): self.logger.error("Set code input ('input#set-symbol-code') not found."); return False
+        self.logger.debug("Set 'set-symbol-code' to '%s'.", base_set_code)
+        if not target_rarity_val: self.logger.debug("No valid live rarity; 'set-symbol-rarity' not explicitly modified.")
+        elif res.get('rarity'): self.logger.debug("Set 'set-symbol-rarity' to '%s'.", target_rarity_val)
+        else: self.logger.error("Set rarity input ('input#set-symbol-rarity') not found on Set Symbol tab.")
         
-        if target_rarity_val:
-            rarity_input_el = self.wait_for_element("input#set-symbol-rarity", timeout=3)
-            if not rarity_input_el: self.logger.error("Set rarity input ('input#set-symbol-rarity') not found on Set Symbol tab.")
-            else:
-                try:
-                    self.click_element_safely(rarity_input_el); rarity_input_el.clear(); rarity_input_el.send_keys(target_rarity_val)
-                    self.logger.info(f"Set 'set-symbol-rarity' to '{target_rarity_val}'.")
-                    self.driver.execute_script("arguments[0].dispatchEvent(new Event('change',{bubbles:true}));", rarity_input_el)
-                except Exception as e: self.logger.error(f"Error with set rarity input: {e}")
-        else: self.logger.info("No valid live rarity; 'set-symbol-rarity' not explicitly modified.")
-        
-        self.logger.info("Set symbol override ops complete. Waiting for fetch..."); time.sleep(self.delays['set_symbol_fetch_wait']); return True
+        self.logger.debug("Set symbol override ops complete. Waiting for fetch..."); self.wait_for_idle(timeout=self.delays['set_symbol_fetch_wait']); return True
+
+    def can_apply_features_in_page(self) -> bool:
+        """True when the page defines every function the enabled features call, so apply_card_features_in_page can run them."""
+        needed = [fn for fn, on in (('resetSetSymbol', self.auto_fit_set_symbol_enabled), ('autoFitArt', self.auto_fit_art_enabled)) if on]
+        return all(self._page_api.get(fn) for fn in needed)
+
+    def apply_card_features_in_page(self, card_name: str) -> bool:
+        """
+        Applies the set-symbol override, Reset Set Symbol and Auto Fit Art with one window.__cc.applyFeatures call
+        instead of the apply_* methods' tab switches and separate scripts. The inputs and functions it uses work on
+        hidden tab panels, so no tab is selected.
+        """
+        ms = lambda key: int(self.delays[key] * 1000)
+        opts = {'setSymbolCode': self.set_symbol_override_code or None, 'setSymbolFetchMs': ms('set_symbol_fetch_wait'), 'idleMs': 150,
+                'resetSetSymbolMs': ms('set_symbol_reset_wait') if self.auto_fit_set_symbol_enabled else None,
+                'autoFitArtMs': ms('art_fit_wait') if self.auto_fit_art_enabled else None}
+        try: res = self.call_js_helper("window.__cc.applyFeatures(%s)" % json.dumps(opts), await_promise=True)
+        except Exception as e: self.logger.error(f"Applying card features for '{card_name}' failed: {e}"); return False
+        if not isinstance(res, dict): self.logger.error(f"Applying card features for '{card_name}' returned {str(res)[:100]}"); return False
+        ok = True
+        if opts['setSymbolCode']:
+            if not res.get('code'): self.logger.error("Set code input ('input#set-symbol-code') not found."); ok = False
+            if res.get('rarity') is None: self.logger.warning("Could not get live rarity; rarity field not explicitly set.")
+            elif not res['rarity']: self.logger.warning("Live rarity empty; rarity field not explicitly set.")
+            elif not res.get('raritySet'): self.logger.error("Set rarity input ('input#set-symbol-rarity') not found on Set Symbol tab.")
+            else: self.logger.debug("Set symbol override '%s' with live rarity '%s'.", opts['setSymbolCode'], res['rarity'])
+            if res.get('fetchStarted') is False: self.logger.debug("No set-symbol fetch seen within %.1fs for '%s'.", self.delays['set_symbol_fetch_wait'], card_name)
+        for fn, label in (('resetSetSymbol', "Reset Set Symbol"), ('autoFitArt', "Auto Fit Art")):
+            if fn in res and res[fn] is not True: self.logger.warning(f"{label} failed for '{card_name}': {fn}() {res[fn]}"); ok = False
+        return ok
 
     def wait_for_canvas_change_and_stabilization(self, initial_data_url_hash: Optional[str]) -> Optional[str]:
-        self.logger.debug(f"Waiting for canvas to change (from hash: {str(initial_data_url_hash)[:10] if initial_data_url_hash else 'None'}) and stabilize...")
+        """
+        Waits for the canvas to move off initial_data_url_hash and hold still; returns the stable hash or None.
+        The poll loop runs inside the page (window.__cc.waitStable), so a card costs one driver round-trip;
+        without in-page hashing it falls back to polling from Python.
+        """
+        if self._canvas_hash_in_page is not False:
+            args = (json.dumps(initial_data_url_hash), int(self.delays['canvas_stabilize_timeout'] * 1000),
+                    int(self.delays['canvas_stability_checks']), int(self.delays['canvas_stability_interval'] * 1000))
+            try: res = self.call_js_helper("window.__cc.waitStable(%s, %d, %d, %d)" % args, await_promise=True)
+            except Exception as e: res = None; self.logger.debug("In-page stabilization failed: %s", e)
+            if isinstance(res, dict) and res.get('hash'):
+                self.logger.debug("Canvas stabilized to new hash: %s (%d in-page polls).", res['hash'][:10], res.get('polls', 0)); return res['hash']
+            if isinstance(res, dict) and res.get('error') == 'timeout':
+                if res.get('sameAsInitial'): self.logger.warning(f"Canvas stabilized to SAME hash as initial ({str(initial_data_url_hash)[:10]}). No change detected.")
+                self.logger.warning("Timeout waiting for canvas to stabilize."); return None
+            if isinstance(res, dict) and res.get('error') == 'no_subtle':
+                self.logger.debug("crypto.subtle unavailable; hashing canvas data URLs in Python."); self._canvas_hash_in_page = False
+            else: self.logger.debug("In-page stabilization returned %r; polling from Python.", res)
+        return self._poll_canvas_until_stable(initial_data_url_hash)
+
+    def _poll_canvas_until_stable(self, initial_data_url_hash: Optional[str]) -> Optional[str]:
+        """Python-side version of window.__cc.waitStable: one canvas_fingerprint() round-trip per poll."""
+        # Per-poll debug lines use lazy %-formatting (%.10s truncates the hash), so nothing is built at INFO level.
+        self.logger.debug("Waiting for canvas to change (from hash: %.10s) and stabilize...", initial_data_url_hash)
         start_time = time.perf_counter(); timeout = self.delays['canvas_stabilize_timeout']
         stability_checks_needed = self.delays['canvas_stability_checks']; interval = self.delays['canvas_stability_interval']
-        js_get_data_url = """
-            const cSels=['#mainCanvas','#canvas','canvas'];let c=null;for(let s of cSels){c=document.querySelector(s);if(c)break;}
-            if(!c||c.width===0||c.height===0)return 'canvas_error:no_canvas_or_zero_dims';
-            try{return c.toDataURL('image/png');}catch(e){console.error('CC Automation: Err toDataURL:',e);return 'canvas_error:to_data_url_failed';}"""
         last_hash = initial_data_url_hash; current_hash = None; stable_count = 0
         changed_from_initial = False if initial_data_url_hash is not None else True 
         first_valid_hash_obtained_this_call = False
 
-        while time.perf_counter() - start_time < timeout:
+        deadline = start_time + timeout
+        while time.perf_counter() < deadline:
+            poll_started = time.perf_counter()
             try:
-                current_data_url = self.driver.execute_script(js_get_data_url)
-                if isinstance(current_data_url, str) and current_data_url.startswith('canvas_error:'):
-                    self.logger.warning(f"Canvas JS err: {current_data_url}");time.sleep(interval);continue
-                if not current_data_url: self.logger.debug("Canvas dataURL null.");time.sleep(interval);continue
-                current_hash = hashlib.md5(current_data_url.encode('utf-8')).hexdigest()
+                current_hash = self.canvas_fingerprint()
+                if isinstance(current_hash, str) and current_hash.startswith('canvas_error:'):
+                    self.logger.warning(f"Canvas JS err: {current_hash}");time.sleep(interval);continue
+                if not current_hash: self.logger.debug("Canvas fingerprint null.");time.sleep(interval);continue
                 if not first_valid_hash_obtained_this_call: 
                     last_hash = current_hash 
                     first_valid_hash_obtained_this_call = True
-                    self.logger.debug(f"Canvas obtained first hash for this check: {current_hash[:10]}...")
+                    self.logger.debug("Canvas obtained first hash for this check: %.10s...", current_hash)
                     if initial_data_url_hash is None: stable_count = 1 
             except Exception as e: self.logger.warning(f"Py ex get/hash canvas: {e}");time.sleep(interval);continue
 
@@ -477,27 +1187,31 @@ class CardConjurerDownloader:
             if initial_data_url_hash is not None: 
                 if not changed_from_initial:
                     if current_hash != initial_data_url_hash:
-                        self.logger.debug(f"Canvas changed from initial. New hash: {current_hash[:10]}...")
+                        self.logger.debug("Canvas changed from initial. New hash: %.10s...", current_hash)
                         changed_from_initial = True; last_hash = current_hash; stable_count = 1
-                    else: self.logger.debug(f"Canvas same as initial ({str(initial_data_url_hash)[:10]})."); stable_count = 0 
+                    else: self.logger.debug("Canvas same as initial (%.10s).", initial_data_url_hash); stable_count = 0 
             
             if changed_from_initial:
                 if current_hash == last_hash: 
-                    stable_count += 1; self.logger.debug(f"Canvas hash stabilized ({stable_count}/{stability_checks_needed}): {current_hash[:10]}...")
+                    stable_count += 1; self.logger.debug("Canvas hash stabilized (%d/%d): %.10s...", stable_count, stability_checks_needed, current_hash)
                 else: 
-                    last_hash_str = str(last_hash[:10]) if last_hash else "None" 
-                    self.logger.debug(f"Canvas hash changed: {current_hash[:10]} from {last_hash_str}. Reset."); stable_count = 1
+                    self.logger.debug("Canvas hash changed: %.10s from %.10s. Reset.", current_hash, last_hash); stable_count = 1
                 last_hash = current_hash
                 if stable_count >= stability_checks_needed:
                     if initial_data_url_hash is not None and current_hash == initial_data_url_hash:
                         self.logger.warning(f"Canvas stabilized to SAME hash as initial ({initial_data_url_hash[:10]}). No change detected.")
                     else:
-                        self.logger.info(f"Canvas stabilized to new hash: {current_hash[:10]}."); return current_hash
-            time.sleep(interval)
+                        self.logger.debug("Canvas stabilized to new hash: %.10s.", current_hash); return current_hash
+            self.wait_between_canvas_polls(poll_started, interval, changed_from_initial, deadline)
         self.logger.warning("Timeout waiting for canvas to stabilize."); return None
 
-    def capture_card_image_data_from_canvas(self, card_name: str, previous_canvas_hash: Optional[str]) -> Tuple[Optional[bytes], Optional[str]]:
-        self.logger.info(f"Preparing to capture canvas for: {card_name}")
+    def capture_card_image_data_from_canvas(self, card_name: str, previous_canvas_hash: Optional[str], defer: bool = False) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Waits for the canvas to stabilize and returns (image bytes or None, stabilized hash).
+        With defer=True the encode is only started in the page and the bytes are PENDING_CAPTURE; collect them
+        with finish_deferred_capture() before the next capture, e.g. after the next card's load has been sent.
+        """
+        self.logger.debug("Preparing to capture canvas for: %s", card_name)
         new_stabilized_hash = self.wait_for_canvas_change_and_stabilization(previous_canvas_hash)
         
         if not new_stabilized_hash:
@@ -506,22 +1220,147 @@ class CardConjurerDownloader:
         if previous_canvas_hash and new_stabilized_hash == previous_canvas_hash:
             self.logger.warning(f"Canvas stabilized but to the SAME hash as previous for '{card_name}': {new_stabilized_hash[:10]}. Capturing current state anyway.")
 
-        js_get_data_url = """
-            const cSels=['#mainCanvas','#canvas','canvas']; let c=null; for(let s of cSels){c=document.querySelector(s);if(c)break;}
-            if(!c||c.width===0||c.height===0)return null; try{return c.toDataURL('image/png');}catch(e){return 'error';}"""
+        cached, self._last_canvas_png = self._last_canvas_png, None
+        if cached and cached[0] == new_stabilized_hash and self.image_mime_type == 'image/png':
+            img_bytes = decode_image_data_url(cached[1])
+            if img_bytes:
+                self.logger.debug("Reused stabilized PNG for '%s' (%d bytes).", card_name, len(img_bytes)); return img_bytes, new_stabilized_hash
+
+        # window.__cc.capture/startCapture hand back the bare base64 payload, so Python decodes it without first
+        # copying a multi-MB slice of a data URL.
+        capture_args = (json.dumps(self.image_mime_type), json.dumps(self.image_quality))
         try:
+            if defer:
+                # A synchronous failure ('error', no canvas) falls through to the immediate path, which logs it.
+                if self.call_js_helper("window.__cc.startCapture(%s, %s)" % capture_args) == 'started': return PENDING_CAPTURE, new_stabilized_hash
             start_time_capture = time.perf_counter()
-            data_url=self.driver.execute_script(js_get_data_url)
-            self.logger.debug(f"JS FINAL canvas data URL call took: {time.perf_counter()-start_time_capture:.4f}s.")
-            if data_url and data_url.startswith('data:image/png;base64,'):
-                img_bytes = base64.b64decode(data_url.split(',',1)[1]); self.logger.info(f"Captured FINAL canvas for '{card_name}' ({len(img_bytes)} bytes)."); return img_bytes, new_stabilized_hash
+            data_url = self.call_js_helper("window.__cc.capture(%s, %s)" % capture_args, await_promise=True)
+            self.logger.debug("JS FINAL canvas data URL call took: %.4fs.", time.perf_counter()-start_time_capture)
+            img_bytes = _decode_capture_payload(data_url)
+            if img_bytes:
+                self.logger.debug("Captured FINAL canvas for '%s' (%d bytes).", card_name, len(img_bytes)); return img_bytes, new_stabilized_hash
             self.logger.error(f"Failed FINAL dataURL for '{card_name}'. Rx: {str(data_url)[:100]}"); return None, new_stabilized_hash 
         except Exception as e: self.logger.error(f"Error capturing FINAL canvas for '{card_name}': {e}",exc_info=True); return None, new_stabilized_hash
 
+    def finish_deferred_capture(self, card_name: str) -> Optional[bytes]:
+        """Collects the image whose encode capture_card_image_data_from_canvas(defer=True) started."""
+        try: payload = self.call_js_helper("window.__cc.takeCapture()", await_promise=True)
+        except Exception as e: self.logger.error(f"Error collecting canvas capture for '{card_name}': {e}"); return None
+        img_bytes = _decode_capture_payload(payload)
+        if img_bytes: self.logger.debug("Captured FINAL canvas for '%s' (%d bytes, encoded while the next card loaded).", card_name, len(img_bytes)); return img_bytes
+        self.logger.error(f"Failed FINAL dataURL for '{card_name}'. Rx: {str(payload)[:100]}"); return None
+
+    def _collect_pending_capture(self, pending: Tuple[int, str, float, float], f_cards_info: list) -> int:
+        """
+        Outputs a deferred capture (index, name, start time, time the encode was started); returns 1 if it was
+        queued, else records the failure.
+        """
+        i, name, started, deferred_at = pending
+        collect_started = time.perf_counter()
+        img_bytes = self.finish_deferred_capture(name)
+        if not img_bytes:
+            f_cards_info.append(f"{name}(capture fail)"); self.failed_card_keys.append(name); return 0
+        # The time between starting the encode and collecting it went to the next card's load; leave it out of this
+        # card's timing, which then covers its own load and capture plus the wait for the encode, as without defer.
+        return 1 if self._output_card_image(name, img_bytes, f_cards_info, i, started + (collect_started - deferred_at)) else 0
+
+    def evaluate_js(self, script_body: str, await_promise: bool = False):
+        """
+        Runs a JS function body (using 'return') and returns its value.
+        Uses CDP Runtime.evaluate when the driver supports it, which skips Selenium's script wrapping and
+        WebElement marshalling; falls back to execute_script otherwise. No arguments can be passed.
+        Raises PageScriptError when the script throws, so callers can tell that apart from a null result.
+        """
+        if self._cdp_available is None:
+            self._cdp_available = hasattr(self.driver, 'execute_cdp_cmd')
+        if self._cdp_available:
+            try:
+                res = self.driver.execute_cdp_cmd('Runtime.evaluate', {
+                    'expression': f"(async () => {{{script_body}}})()" if await_promise else f"(() => {{{script_body}}})()",
+                    'returnByValue': True, 'awaitPromise': await_promise})
+            except Exception as e:
+                self.logger.warning(f"CDP Runtime.evaluate failed ({e}); using execute_script from now on.")
+                self._cdp_available = False
+            else:
+                details = res.get('exceptionDetails')
+                if details: raise PageScriptError((details.get('exception') or {}).get('description') or details.get('text') or str(details))
+                return res.get('result', {}).get('value')
+        if await_promise:
+            res = self.driver.execute_async_script(
+                f"const done=arguments[arguments.length-1]; (async () => {{{script_body}}})().then(v => done({{value: v}}), e => done({{error: String(e)}}));")
+            if isinstance(res, dict) and 'error' in res: raise PageScriptError(res['error'])
+            return res.get('value') if isinstance(res, dict) else res
+        return self.driver.execute_script(script_body)
+
+    def canvas_fingerprint(self) -> Optional[str]:
+        """
+        Returns a hash of what the canvas shows: a SHA-1 of its pixels computed in the page (window.__cc.canvasHash),
+        or, where crypto.subtle is unavailable, an xxHash (or BLAKE2b) of its PNG data URL. May return a 'canvas_error:...' string or None.
+        """
+        if self._canvas_hash_in_page is not False:
+            fingerprint = self.call_js_helper("window.__cc.canvasHash()", await_promise=True)
+            if fingerprint != 'no_subtle': return fingerprint
+            self.logger.debug("crypto.subtle unavailable; hashing canvas data URLs in Python."); self._canvas_hash_in_page = False
+        data_url = self.call_js_helper("window.__cc.canvasDataUrl('image/png')")
+        if data_url and data_url[:PNG_DATA_URL_PREFIX_LEN] == PNG_DATA_URL_PREFIX:
+            # Only the base64 payload is hashed; the prefix is the same for every frame.
+            fingerprint = _data_url_fingerprint(data_url[PNG_DATA_URL_PREFIX_LEN:].encode('ascii'))
+            # The stabilized frame's PNG is the capture itself; keep it so the capture doesn't encode it again.
+            self._last_canvas_png = (fingerprint, data_url)
+            return fingerprint
+        return data_url
+
+    def _get_current_canvas_hash(self) -> Optional[str]:
+        """Returns the hash of whatever the canvas currently shows, or None if it cannot be read."""
+        try: fingerprint = self.canvas_fingerprint()
+        except Exception as e:
+            self.logger.warning(f"Could not read current canvas for hashing: {e}"); return None
+        if fingerprint and not fingerprint.startswith('canvas_error:'): return fingerprint
+        return None
+
+    def can_batch_capture(self) -> bool:
+        """Batch capture only applies when no per-card UI work (tabs, buttons) is needed between load and capture."""
+        if self.auto_fit_art_enabled or self.auto_fit_set_symbol_enabled or self.set_symbol_override_code:
+            return False
+        # Re-probe if the cached check was negative; scripts may still have been loading at navigation time.
+        return bool(self._page_api.get('loadCard') or self.probe_page_api().get('loadCard'))
+
+    JS_BATCH_CAPTURE = """
+        const done=arguments[arguments.length-1];
+        if(!window.__cc){done('__cc_missing__');return;}
+        window.__cc.captureBatch(arguments[0], arguments[1]).then(done, e=>done(String(e)));"""
+
+    def batch_capture_cards(self, card_names: List[str]) -> List[Dict]:
+        """
+        Loads and captures a list of cards inside the page with one window.__cc.captureBatch call.
+        Each card is loaded the way load_card does it (window.__cc.load), then the canvas is polled until it
+        stays unchanged for the configured number of stability checks.
+        Returns one dict per card: {'name': ..., 'dataUrl': ...} or {'name': ..., 'error': ...}.
+        """
+        opts = {
+            'timeoutMs': int(self.delays['canvas_stabilize_timeout'] * 1000),
+            'checks': int(self.delays['canvas_stability_checks']),
+            'intervalMs': int(self.delays['canvas_stability_interval'] * 1000),
+            'mime': self.image_mime_type,
+            'quality': self.image_quality,
+            'loadCapMs': int(self.delays['card_load_barrier'] * 1000),
+        }
+        # Worst case every card times out after a capped load.
+        self.driver.set_script_timeout(len(card_names) * (self.delays['canvas_stabilize_timeout'] + self.delays['card_load_barrier'] + 1) + 10)
+        t = time.perf_counter()
+        results = self.driver.execute_async_script(self.JS_BATCH_CAPTURE, card_names, opts)
+        if results == '__cc_missing__':
+            self.logger.debug("Page JS helpers missing; reinstalling."); self.install_js_helpers()
+            results = self.driver.execute_async_script(self.JS_BATCH_CAPTURE, card_names, opts)
+        self.logger.debug("JS: Batch capture of %d cards took %.4fs", len(card_names), time.perf_counter() - t)
+        if not isinstance(results, list):
+            self.logger.error(f"Batch capture returned unexpected result: {str(results)[:100]}"); return [{'name': n, 'error': 'bad_result'} for n in card_names]
+        return results
+
     def _generate_filename(self, card_name: str) -> str:
         """
         Generates a sanitized, lowercase filename based on card name, set, and collector number.
-        Format: [card-name]_[set-code]_[collector-number].png
+        Format: [card-name]_[set-code]_[collector-number].[ext] (ext follows --image-format)
         Example: izzet-boilerworks_2x2_408.png
         
         Note: card_name parameter is the dropdown identifier, but we extract the actual
@@ -548,22 +1387,19 @@ class CardConjurerDownloader:
             set_code = card_data.get('infoSet', set_code_default)
             collector_number = card_data.get('infoNumber', collector_number_default)
             
-            self.logger.debug(f"For dropdown '{card_name}': actual name='{actual_card_name}', set='{set_code}', num='{collector_number}'.")
+            self.logger.debug("For dropdown '%s': actual name='%s', set='%s', num='%s'.", card_name, actual_card_name, set_code, collector_number)
         else:
             self.logger.warning(f"Could not find parsed data for '{card_name}'. Using dropdown identifier as fallback.")
             # Fallback: use the dropdown identifier, but try to clean it if it's already formatted
             if '_' in card_name:
                 # Assume it's already in format "name_set_number" and extract just the name part
                 actual_card_name = card_name.split('_')[0]
-                self.logger.debug(f"Extracted name part from formatted identifier: '{actual_card_name}'")
+                self.logger.debug("Extracted name part from formatted identifier: '%s'", actual_card_name)
             else:
                 actual_card_name = card_name
         
         # Sanitize actual card name: lowercase, replace spaces with dashes, remove special characters
-        import re
-        clean_name = re.sub(r'[^\w\s-]', '', actual_card_name.lower())  # Remove special chars except spaces and dashes
-        clean_name = re.sub(r'\s+', '-', clean_name.strip())           # Replace spaces with dashes
-        clean_name = re.sub(r'-+', '-', clean_name)                    # Collapse multiple dashes
+        clean_name = _slugify_card_name(actual_card_name)
         
         # Clean up set code and collector number
         set_code_clean = str(set_code).lower().strip()
@@ -580,25 +1416,25 @@ class CardConjurerDownloader:
         
         # Final sanitization for any remaining invalid characters
         # Allow alphanumeric, dashes (for card name), and underscores (for delimiters)
-        final_filename_base = "".join(c for c in base_filename if c.isalnum() or c == '-' or c == '_')
+        if base_filename.isascii():
+            final_filename_base = base_filename.translate(_FILENAME_ASCII_STRIP)
+        else: # Non-ASCII letters are kept if isalnum(), which the ASCII table can't express
+            final_filename_base = _RE_FILENAME_UNSAFE.sub('', base_filename)
         
-        return f"{final_filename_base}.png"
+        return f"{final_filename_base}.{self.image_extension}"
 
     def prime_rendering_quirks(self) -> Optional[str]: # MODIFIED
         if not self.cards: self.logger.info("No cards in list, skipping rendering priming."); return None
         self.logger.info("Applying rendering quirks workaround (flavor text and first card)...")
-        
+
         initial_hash_for_priming: Optional[str] = None
         if self._current_active_tab != "art":
             if not self._navigate_to_creator_tab("art"):
                 self.logger.warning("Priming: Could not switch to 'art' tab for initial hash.")
         if self._current_active_tab == "art":
-             temp_js_get_url="""const cSels=['#mainCanvas','#canvas','canvas'];let c=null;for(let s of cSels){c=document.querySelector(s);if(c)break;}
-                                if(!c||c.width===0||c.height===0)return null;try{return c.toDataURL('image/png');}catch(e){return 'error';}"""
-             temp_url = self.driver.execute_script(temp_js_get_url)
-             if temp_url and temp_url.startswith('data:image/png;base64,'):
-                 initial_hash_for_priming = hashlib.md5(temp_url.encode('utf-8')).hexdigest()
-                 self.logger.debug(f"Priming: Initial hash on 'art' tab: {initial_hash_for_priming[:10] if initial_hash_for_priming else 'None'}")
+             initial_hash_for_priming = self._get_current_canvas_hash()
+             if initial_hash_for_priming:
+                 self.logger.debug("Priming: Initial hash on 'art' tab: %.10s", initial_hash_for_priming)
 
         hash_after_flavor_prime_ops = initial_hash_for_priming 
 
@@ -679,116 +1515,292 @@ class CardConjurerDownloader:
         self._current_active_tab = "art" 
         return final_first_card_hash
 
+    def _output_card_image(self, name: str, img_bytes: bytes, f_cards_info: list, index: int, started: float, from_cache: bool = False) -> bool:
+        """Queues a captured image for the writer thread (local file, ZIP entry or server upload).
+
+        This is the one INFO line per card; the routine steps before it log at DEBUG.
+        """
+        output_filename = self._generate_filename(name)
+        self.logger.info("[%d/%d] %s -> %s (%.0fms%s)", index + 1, len(self.cards), name, output_filename, (time.perf_counter() - started) * 1000, ", cached" if from_cache else "")
+        # Cached images were optimized before they were stored.
+        if self._optimizer and not from_cache: img_bytes = self._optimizer.submit(self._optimize_png_bytes, name, img_bytes)
+        self._write_queue.put((name, output_filename, img_bytes))
+        f_cards_info.append({'name': output_filename})
+        return True
+
+    def _card_cache_key(self, name: str) -> Optional[str]:
+        """Hashes the card's saved data with every setting that changes its image; None if the card's data is unknown."""
+        card_data = self.parsed_card_data_map.get(name)
+        if not card_data: return None
+        key_parts = [CACHE_FORMAT_VERSION, self.url, card_data, self._frame, self.auto_fit_art_enabled, self.auto_fit_set_symbol_enabled,
+                     self.set_symbol_override_code, self.image_format, self.image_quality, self.optimize_png]
+        return hashlib.blake2b(json.dumps(key_parts, sort_keys=True, default=str).encode('utf-8'), digest_size=16).hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{self.image_extension}")
+
+    def _output_cached_cards(self, f_cards_info: list) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Outputs every card found in the capture cache. Returns the number output and the (index, name) pairs still to capture.
+        Every card left to capture gets its key in self._cache_keys, so the writer thread (re)stores its image.
+        """
+        self._cache_keys = {}
+        if not self.use_cache: return 0, list(enumerate(self.cards))
+        try: Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        except OSError as e: self.logger.warning(f"Capture cache disabled, cannot create {self.cache_dir}: {e}"); return 0, list(enumerate(self.cards))
+        s_cards, remaining = 0, []
+        for i, name in enumerate(self.cards):
+            started = time.perf_counter(); key = self._card_cache_key(name)
+            if key is None: remaining.append((i, name)); continue
+            img_bytes = None
+            if not self.refresh_cache:
+                try:
+                    with open(self._cache_path(key), 'rb') as f: img_bytes = f.read()
+                except OSError: pass
+            if not img_bytes: self._cache_keys[name] = key; remaining.append((i, name)); continue
+            if self._output_card_image(name, img_bytes, f_cards_info, i, started, from_cache=True): s_cards += 1
+        if s_cards: self.logger.info(f"Reused {s_cards} cached image(s); {len(remaining)} card(s) left to capture.")
+        return s_cards, remaining
+
+    def _store_in_cache(self, name: str, img_bytes: bytes):
+        """Writer-thread side of the capture cache: saves a captured image under its key via an atomic rename."""
+        key = self._cache_keys.get(name)
+        if not key: return
+        path = self._cache_path(key); part_path = f"{path}.{os.getpid()}.part"
+        try:
+            with open(part_path, 'wb') as f: f.write(img_bytes)
+            os.replace(part_path, path)
+        except OSError as e: self.logger.debug("Could not cache '%s': %s", name, e)
+
+    def _upload_image_file(self, output_filename: str, img_bytes: bytes):
+        """Writer-thread sink for upload mode. Raises FileExistsError to skip an existing file, OSError on failure."""
+        upload_url = self._upload_url_prefix + output_filename.lstrip('/')
+
+        if not self.overwrite_server_file and check_server_file_exists(upload_url, self.debug_mode):
+            raise FileExistsError(upload_url)
+        if not upload_file_to_server(upload_url, img_bytes, self.image_mime_type, self.debug_mode):
+            raise OSError(f"upload to {upload_url} failed")
+
+    def _apply_write_errors(self, write_errors: List[Tuple[str, str, Exception]], f_cards_info: list, destination: str) -> list:
+        """Turns writer-thread failures back into f_cards_info entries (and failed keys, except for skipped uploads)."""
+        for name, output_filename, e_write in write_errors:
+            f_cards_info = [c for c in f_cards_info if not (isinstance(c, dict) and c['name'] == output_filename)]
+            if isinstance(e_write, FileExistsError):
+                self.logger.warning(f"Skipping upload for '{output_filename}', file exists on server. Use --overwrite-server-file.")
+                f_cards_info.append(f"{name}(exists on server)"); continue
+            self.logger.error(f"Failed writing '{output_filename}' to {destination}: {e_write}")
+            f_cards_info.append(f"{name}({'upload' if self.upload_to_server else 'write'} fail)"); self.failed_card_keys.append(name)
+        return f_cards_info
+
+    def _optimize_png_bytes(self, name: str, img_bytes: bytes) -> bytes:
+        """Re-encodes a PNG with Pillow's optimize=True (lossless). Returns the original bytes if that isn't smaller."""
+        try:
+            with Image.open(BytesIO(img_bytes)) as im:
+                out = BytesIO(); im.save(out, 'PNG', optimize=True); optimized = out.getvalue()
+        except Exception as e: self.logger.warning(f"PNG optimize failed for '{name}': {e}"); return img_bytes
+        if len(optimized) >= len(img_bytes): return img_bytes
+        self.logger.debug("Optimized PNG for '%s': %d -> %d bytes", name, len(img_bytes), len(optimized))
+        return optimized
+
+    def _write_image_file(self, output_filename: str, img_bytes: bytes):
+        """Writes one image into output_dir via a '.part' file and an atomic rename, so readers never see a partial image."""
+        final_path = os.path.join(self.output_dir, output_filename)
+        part_path = os.path.join(self._staging_dir or self.output_dir, output_filename + ".part")
+        with open(part_path, 'wb') as f: f.write(img_bytes)
+        os.replace(part_path, final_path)
+
+    def _start_image_writer(self, sink):
+        """Starts a thread that passes queued (name, filename, bytes) items to sink(filename, bytes) while the browser renders the next card."""
+        self._write_queue = queue.Queue(maxsize=4)
+        self._write_errors = []
+        # PNG optimization runs on its own small pool; the writer takes results in capture order.
+        if self.optimize_png: self._optimizer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cc-png-opt")
+        def writer():
+            while True:
+                item = self._write_queue.get()
+                if item is None: break
+                name, output_filename, img_bytes = item
+                try:
+                    if isinstance(img_bytes, Future): img_bytes = img_bytes.result()
+                    sink(output_filename, img_bytes)
+                except Exception as e: self._write_errors.append((name, output_filename, e)); continue
+                self._store_in_cache(name, img_bytes)
+        self._writer_thread = threading.Thread(target=writer, name="cc-image-writer", daemon=True)
+        self._writer_thread.start()
+
+    def _stop_image_writer(self) -> List[Tuple[str, str, Exception]]:
+        """Flushes the write queue, joins the writer thread and returns any (name, filename, error) write failures."""
+        if self._writer_thread is None: return []
+        self._write_queue.put(None); self._writer_thread.join()
+        self._writer_thread = None; self._write_queue = None
+        if self._optimizer: self._optimizer.shutdown(wait=True); self._optimizer = None
+        return self._write_errors
+
+    def _batch_process_cards(self, primed_hash: Optional[str], f_cards_info: list, cards: List[Tuple[int, str]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Captures the (index, name) cards through batch_capture_cards instead of one WebDriver round-trip per step.
+        Returns the number of cards output and the (index, name) pairs that need a per-card retry.
+        """
+        s_cards, retry = 0, []
+        pending = list(cards)
+        if primed_hash is not None and pending and pending[0][0] == 0:
+            # Priming already left the first card loaded and stable; capture it as-is.
+            i, name = pending.pop(0); card_started = time.perf_counter()
+            img_bytes, _ = self.capture_card_image_data_from_canvas(name, None)
+            if img_bytes:
+                if self._output_card_image(name, img_bytes, f_cards_info, i, card_started): s_cards += 1
+            else: retry.append((i, name))
+
+        for start in range(0, len(pending), self.batch_capture_chunk_size):
+            chunk = pending[start:start + self.batch_capture_chunk_size]
+            self.logger.info(f"Batch capturing cards {chunk[0][0] + 1}-{chunk[-1][0] + 1}/{len(self.cards)}...")
+            chunk_started = time.perf_counter()
+            try: results = self.batch_capture_cards([name for _, name in chunk])
+            except Exception as e:
+                self.logger.error(f"Batch capture failed: {e}", exc_info=True); retry.extend(chunk); continue
+            results_by_name = {r.get('name'): r for r in results if isinstance(r, dict)}
+            for i, name in chunk:
+                result = results_by_name.get(name) or {}
+                img_bytes = decode_image_data_url(result.get('dataUrl'), self.image_mime_type)
+                if not img_bytes:
+                    self.logger.warning(f"Batch capture failed for '{name}': {result.get('error', 'no result')}")
+                    retry.append((i, name)); continue
+                self.logger.debug("Captured canvas for '%s' (%d bytes) [batch %d/%d].", name, len(img_bytes), i+1, len(self.cards))
+                if self._output_card_image(name, img_bytes, f_cards_info, i, chunk_started): s_cards += 1
+        return s_cards, retry
+
     # --- MODIFIED: Now tracks failed card keys ---
     def process_and_output_all_cards(self) -> bool:
         if self.upload_to_server:
             self.logger.info("Starting image processing for SERVER UPLOAD.")
         else:
-            self.logger.info("Starting image processing for LOCAL DIRECTORY output (via temp ZIP).")
+            self.logger.info("Starting image processing for LOCAL DIRECTORY output.")
 
         self.failed_card_keys = [] # Reset the list for this run
-        current_canvas_hash: Optional[str] = None 
         if not self.cards: self.logger.info("Card list empty, fetching..."); self.get_saved_cards()
         if not self.cards: self.logger.error("No cards to process."); return False
-        
-        current_canvas_hash = self.prime_rendering_quirks()
-        s_cards, f_cards_info = 0, []
+
+        if self.upload_to_server:
+            # Uploads run on the writer thread too, so the HEAD/PUT round-trips overlap the next card's render.
+            self._start_image_writer(self._upload_image_file)
+            try: _, f_cards_info = self._capture_all_cards()
+            finally: write_errors = self._stop_image_writer()
+            f_cards_info = self._apply_write_errors(write_errors, f_cards_info, self.image_server_base_url)
+            failed_uploads = [c for c in f_cards_info if isinstance(c, str)]
+            if failed_uploads: self.logger.warning(f"Failed ops ({len(failed_uploads)}): {', '.join(failed_uploads)}")
+            return any(isinstance(c, dict) for c in f_cards_info)
+
+        # Local mode: each capture is handed to a writer thread as soon as it is taken (see _output_card_image) and
+        # written straight into output_dir, so only a few cards' images are held in memory, file writes overlap the
+        # next card's render, and each image hits the disk once (no temp ZIP to write, re-read and extract).
+        # With --output-zip the same writer thread appends to one archive instead; it is built as '<zip>.part'
+        # and only renamed into place once at least one card made it in.
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        zf, zip_fp, zip_part = None, None, None
+        if self.output_zip:
+            zip_part = f"{self.output_zip}.part"; Path(zip_part).parent.mkdir(parents=True, exist_ok=True)
+            # Entries come from in-memory bytes (sizes known up front), so force_zip64/copyfileobj buy nothing;
+            # a 1 MiB write buffer does cut the many small header/data writes down to a few large ones.
+            zip_fp = open(zip_part, 'wb', buffering=ZIP_WRITE_BUFFER)
+            zf = zipfile.ZipFile(zip_fp, 'w', ZIP_COMPRESSION[self.zip_compression], allowZip64=True, compresslevel=ZIP_DEFLATE_LEVEL)
+            self.logger.info(f"Writing images into ZIP: {self.output_zip} (compression: {self.zip_compression})")
+        else:
+            # '.part' files go to a staging dir inside output_dir (same filesystem, so os.replace stays atomic);
+            # whatever is left there after failed or interrupted writes goes in one rmtree.
+            self._staging_dir = tempfile.mkdtemp(prefix=".cc_staging_", dir=self.output_dir)
+        self._start_image_writer(zf.writestr if zf else self._write_image_file)
+        try: s_cards, f_cards_info = self._capture_all_cards()
+        finally:
+            write_errors = self._stop_image_writer()
+            if zf: zf.close(); zip_fp.close()
+            if self._staging_dir: shutil.rmtree(self._staging_dir, ignore_errors=True); self._staging_dir = None
+        destination = self.output_zip or self.output_dir
+        f_cards_info = self._apply_write_errors(write_errors, f_cards_info, destination)
+        successful_local_cards = [c for c in f_cards_info if isinstance(c, dict)]
+        failed_local_cards = [c for c in f_cards_info if isinstance(c, str)]
+
+        if not successful_local_cards:
+            self.logger.warning("No cards were successfully captured for local saving.")
+            if failed_local_cards: self.logger.warning(f"Failed ops ({len(failed_local_cards)}): {', '.join(failed_local_cards)}")
+            if zip_part and os.path.exists(zip_part): os.remove(zip_part)
+            return False
+
+        if zip_part: os.replace(zip_part, self.output_zip)
+        self.logger.info(f"Successfully saved {len(successful_local_cards)} image(s) to {destination}.")
+        if failed_local_cards: self.logger.warning(f"Failed ops ({len(failed_local_cards)}): {', '.join(failed_local_cards)}")
+        return True
+
+    def _capture_all_cards(self) -> Tuple[int, list]:
+        """Primes the renderer, then captures and outputs every card. Returns (success count, f_cards_info)."""
+        f_cards_info: list = []
+        s_cards, cards_to_process = self._output_cached_cards(f_cards_info)
+        if not cards_to_process: return s_cards, f_cards_info
+        current_canvas_hash: Optional[str] = self.prime_rendering_quirks()
+
+        first_card_primed = current_canvas_hash is not None
+        if self.batch_capture_enabled and self.can_batch_capture():
+            s_batch, cards_to_process = self._batch_process_cards(current_canvas_hash, f_cards_info, cards_to_process)
+            s_cards += s_batch
+            current_canvas_hash = self._get_current_canvas_hash(); first_card_primed = False
+            if cards_to_process: self.logger.info(f"Retrying {len(cards_to_process)} card(s) that failed batch capture one at a time.")
 
         # --- Main processing loop ---
-        for i, name in enumerate(self.cards):
-            self.logger.info(f"Processing {i+1}/{len(self.cards)}: '{name}'")
-            is_first_card_and_was_successfully_primed = (i == 0 and current_canvas_hash is not None)
+        # Each card's image is encoded in the page while the next card loads (capture with defer=True);
+        # `pending` holds (index, name, start time, encode start time) of the capture still to be collected.
+        pending: Optional[Tuple[int, str, float, float]] = None
+        # Only the optional per-card features need particular tabs, and only when they go through the UI. load_card
+        # sets the import panel's <select>, which stays in the DOM while hidden, and the canvas sits outside the tab
+        # panels, so otherwise the import -> art round trip per card is skipped.
+        features = bool(self.set_symbol_override_code or self.auto_fit_set_symbol_enabled or self.auto_fit_art_enabled)
+        features_in_page = features and self.can_apply_features_in_page()
+        ui_steps = features and not features_in_page
+        for i, name in cards_to_process:
+            self.logger.debug("Processing %d/%d: '%s'", i+1, len(self.cards), name); card_started = time.perf_counter()
+            is_first_card_and_was_successfully_primed = (i == 0 and first_card_primed)
             
             if not is_first_card_and_was_successfully_primed:
-                if not self._navigate_to_creator_tab("import"):
+                if ui_steps and not self._navigate_to_creator_tab("import"):
                     f_cards_info.append(f"{name}(import nav fail)"); self.failed_card_keys.append(name); continue
                 if not self.load_card(name):
                     f_cards_info.append(f"{name}(load fail)"); self.failed_card_keys.append(name); continue
             else:
-                self.logger.info(f"Skipping explicit load for '{name}' (handled by priming). Ensuring 'art' tab.")
-                if self._current_active_tab != "art": 
+                self.logger.info(f"Skipping explicit load for '{name}' (handled by priming).")
+                if ui_steps and self._current_active_tab != "art": 
                     if not self._navigate_to_creator_tab("art"):
                         f_cards_info.append(f"{name}(art tab nav fail post-prime)"); self.failed_card_keys.append(name); continue
             
-            # Apply optional features
-            if self.set_symbol_override_code and not self.apply_set_symbol_override(self.set_symbol_override_code): self.logger.warning(f"Failed set symbol override for '{name}'.")
-            if self.auto_fit_set_symbol_enabled and not self.apply_auto_fit_set_symbol(): self.logger.warning(f"Failed auto fit set symbol for '{name}'.")
-            if self.auto_fit_art_enabled and not self.apply_auto_fit_art(): self.logger.warning(f"Failed auto fit art for '{name}'.")
+            # The previous card's image finished encoding while this one loaded; collect it before capturing again.
+            if pending: s_cards += self._collect_pending_capture(pending, f_cards_info); pending = None
+
+            # Apply optional features. Capture detects render completion itself, but these UI steps
+            # read/modify the freshly loaded card, so give the load a moment before touching them.
+            if features: self.wait_for_idle(timeout=self.delays['card_load_js_ops'])
+            if features_in_page: self.apply_card_features_in_page(name)
+            elif ui_steps:
+                if self.set_symbol_override_code and not self.apply_set_symbol_override(self.set_symbol_override_code): self.logger.warning(f"Failed set symbol override for '{name}'.")
+                if self.auto_fit_set_symbol_enabled and not self.apply_auto_fit_set_symbol(): self.logger.warning(f"Failed auto fit set symbol for '{name}'.")
+                if self.auto_fit_art_enabled and not self.apply_auto_fit_art(): self.logger.warning(f"Failed auto fit art for '{name}'.")
             
             # Capture canvas
             capture_tab = "art" 
-            if self._current_active_tab != capture_tab: 
+            if ui_steps and self._current_active_tab != capture_tab: 
                 self.logger.info(f"Ensuring on '{capture_tab}' tab for canvas capture of '{name}'.")
                 if not self._navigate_to_creator_tab(capture_tab):
                     f_cards_info.append(f"{name}(capture tab nav fail)"); self.failed_card_keys.append(name); continue
             
-            img_bytes, new_hash_after_capture = self.capture_card_image_data_from_canvas(name, current_canvas_hash)
+            img_bytes, new_hash_after_capture = self.capture_card_image_data_from_canvas(name, current_canvas_hash, defer=True)
             current_canvas_hash = new_hash_after_capture 
+            if img_bytes is PENDING_CAPTURE: pending = (i, name, card_started, time.perf_counter()); continue
             
             if not img_bytes:
                 f_cards_info.append(f"{name}(capture fail)")
                 self.failed_card_keys.append(name)
                 continue
 
-            output_filename = self._generate_filename(name)
-            self.logger.info(f"Generated output filename: '{output_filename}'")
-
-            if self.upload_to_server:
-                path_parts = [self.output_server_path.strip('/'), output_filename.lstrip('/')]
-                full_path = "/".join(p for p in path_parts if p)
-                if not full_path.startswith('/'): full_path = '/' + full_path
-                upload_url = f"{self.image_server_base_url.rstrip('/')}{full_path}"
+            if self._output_card_image(name, img_bytes, f_cards_info, i, card_started): s_cards += 1
 
-                if not self.overwrite_server_file and check_server_file_exists(upload_url, self.debug_mode):
-                    self.logger.warning(f"Skipping upload for '{output_filename}', file exists on server. Use --overwrite-server-file.")
-                    f_cards_info.append(f"{name}(exists on server)")
-                    continue
-                
-                if upload_file_to_server(upload_url, img_bytes, 'image/png', self.debug_mode):
-                    s_cards += 1
-                else:
-                    f_cards_info.append(f"{name}(upload fail)")
-                    self.failed_card_keys.append(name)
-            else:
-                f_cards_info.append({'name': output_filename, 'bytes': img_bytes})
-                s_cards += 1
-
-        # --- Post-loop processing for local mode ---
-        if not self.upload_to_server:
-            successful_local_cards = [c for c in f_cards_info if isinstance(c, dict)]
-            failed_local_cards = [c for c in f_cards_info if isinstance(c, str)]
-            
-            if not successful_local_cards:
-                self.logger.warning("No cards were successfully captured for local saving.")
-                if failed_local_cards: self.logger.warning(f"Failed ops ({len(failed_local_cards)}): {', '.join(failed_local_cards)}")
-                return False
-
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            zip_temp_fp = Path(self.output_dir) / f"CC_Temp_v7.1_{ts}.zip"
-            self.logger.info(f"Creating temporary ZIP for local extraction: {zip_temp_fp}")
-            try:
-                with zipfile.ZipFile(zip_temp_fp, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    for card_data in successful_local_cards:
-                        zf.writestr(card_data['name'], card_data['bytes'])
-                
-                self.logger.info(f"Extracting {len(successful_local_cards)} images from {zip_temp_fp} to {self.output_dir}...")
-                with zipfile.ZipFile(zip_temp_fp, 'r') as zf_read:
-                    zf_read.extractall(self.output_dir)
-                self.logger.info(f"Successfully extracted {len(successful_local_cards)} image(s).")
-
-            except Exception as e_zip:
-                self.logger.error(f"Temp ZIP/Extraction error: {e_zip}", exc_info=True)
-                return False
-            finally:
-                if os.path.exists(zip_temp_fp):
-                    try: os.remove(zip_temp_fp); self.logger.info(f"Deleted temp ZIP: {zip_temp_fp}")
-                    except Exception as e_del: self.logger.error(f"Error deleting temp ZIP: {e_del}")
-            
-            if failed_local_cards: self.logger.warning(f"Failed ops ({len(failed_local_cards)}): {', '.join(failed_local_cards)}")
-            return len(successful_local_cards) > 0
-
-        if f_cards_info: self.logger.warning(f"Failed ops ({len(f_cards_info)}): {', '.join(f_cards_info)}")
-        return s_cards > 0
+        if pending: s_cards += self._collect_pending_capture(pending, f_cards_info)
+        return s_cards, f_cards_info
 
     # --- NEW: Method to generate a .cardconjurer file for failed cards ---
     def _write_failed_cards_file(self, original_filepath: str):
@@ -826,75 +1838,231 @@ class CardConjurerDownloader:
             self.logger.error(f"Failed to write failed cards file to {failed_filepath}: {e}", exc_info=True)
 
     # --- MODIFIED: Calls the new method to write failed cards file ---
-    def run(self, cardconjurer_file=None, action="zip", headless=False, frame=None, args_for_optional_features=None):
-        self.logger.info(f"Run (v7.1) action:{action} headless:{headless} frame:{frame}")
-        if args_for_optional_features:
-            self.auto_fit_art_enabled = getattr(args_for_optional_features, 'auto_fit_art', False)
-            self.auto_fit_set_symbol_enabled = getattr(args_for_optional_features, 'auto_fit_set_symbol', False)
-            self.set_symbol_override_code = getattr(args_for_optional_features, 'set_symbol_override', None)
-            if self.auto_fit_art_enabled: self.logger.info("Opt Feature: Auto Fit Art ENABLED")
-            if self.auto_fit_set_symbol_enabled: self.logger.info("Opt Feature: Auto Fit Set Symbol (Reset) ENABLED")
-            if self.set_symbol_override_code: self.logger.info(f"Opt Feature: Set Symbol Override with code '{self.set_symbol_override_code}' (will use live rarity).")
-        try:
-            self.setup_driver(headless=headless) 
-            if not self.navigate_to_card_conjurer(): return 
-            time.sleep(self.delays['js_init'])
-            
-            if cardconjurer_file:
-                if not self._parse_cardconjurer_file_content(cardconjurer_file):
-                    self.logger.warning(f"Failed to parse {cardconjurer_file}. Data-dependent features may fail.")
-            
-            if frame: 
-                if self._current_active_tab != "art": 
-                    if not self._navigate_to_creator_tab("art"):
-                        self.logger.warning("Could not navigate to 'art' for frame setting.")
-                if self._current_active_tab == "art" and not self.set_auto_frame(frame):
-                     self.logger.warning(f"Failed frame setting for '{frame}'.")
+    def _configure_optional_features(self, args_for_optional_features):
+        if not args_for_optional_features: return
+        self.auto_fit_art_enabled = getattr(args_for_optional_features, 'auto_fit_art', False)
+        self.auto_fit_set_symbol_enabled = getattr(args_for_optional_features, 'auto_fit_set_symbol', False)
+        self.set_symbol_override_code = getattr(args_for_optional_features, 'set_symbol_override', None)
+        self.batch_capture_enabled = not getattr(args_for_optional_features, 'no_batch_capture', False)
+        if self.auto_fit_art_enabled: self.logger.info("Opt Feature: Auto Fit Art ENABLED")
+        if self.auto_fit_set_symbol_enabled: self.logger.info("Opt Feature: Auto Fit Set Symbol (Reset) ENABLED")
+        if self.set_symbol_override_code: self.logger.info(f"Opt Feature: Set Symbol Override with code '{self.set_symbol_override_code}' (will use live rarity).")
+        if not self.batch_capture_enabled: self.logger.info("Batch capture DISABLED; cards will be captured one at a time.")
+
+    # --- Session lifecycle: open() once, process() each file, close() once ---
+    def open(self, headless=False) -> bool:
+        """Starts (or attaches to) the browser and loads Card Conjurer."""
+        self.setup_driver(headless=headless) 
+        if not self.navigate_to_card_conjurer(): return False
+        self.wait_for_idle(timeout=self.delays['js_init'])
+        return True
+
+    def _reset_file_state(self):
+        """Clears per-file state so the next process() call starts clean in the same browser session."""
+        self.cards = []; self.parsed_card_data_map = {}; self.full_card_list_from_file = []
+        self.failed_card_keys = []; self._card_option_snapshot = None
+
+    def process(self, cardconjurer_file=None, action="zip", frame=None):
+        """Uploads one .cardconjurer file into the open session and outputs its cards."""
+        if self._files_processed: self._reset_file_state()
+        self._files_processed += 1
+        if cardconjurer_file:
+            if not self._parse_cardconjurer_file_content(cardconjurer_file):
+                self.logger.warning(f"Failed to parse {cardconjurer_file}. Data-dependent features may fail.")
+        
+        self._frame = frame
+        if frame: 
+            if self._current_active_tab != "art": 
+                if not self._navigate_to_creator_tab("art"):
+                    self.logger.warning("Could not navigate to 'art' for frame setting.")
+            if self._current_active_tab == "art" and not self.set_auto_frame(frame):
+                 self.logger.warning(f"Failed frame setting for '{frame}'.")
+        
+        if cardconjurer_file:
+            if not self.upload_cardconjurer_file(file_path=cardconjurer_file): 
+                self.logger.error(f"Fail upload/load from: {cardconjurer_file}. Abort."); return
+        elif not cardconjurer_file: 
+            self.logger.info("No file. Check existing cards...");
+            on_imp = self._navigate_to_creator_tab("import") 
+            if on_imp and not self.check_cards_loaded(): self.logger.warning("No cards loaded (dropdown).")
+            elif not on_imp: self.logger.warning("Cannot check cards, import nav fail.")
+
+        if action=="zip": # "zip" action now means "process and output"
+            if not self.cards: self.get_saved_cards() 
+            if not self.cards: self.logger.error("No cards to process."); return 
             
-            if cardconjurer_file:
-                if not self.upload_cardconjurer_file(file_path=cardconjurer_file): 
-                    self.logger.error(f"Fail upload/load from: {cardconjurer_file}. Abort."); return
-            elif not cardconjurer_file: 
-                self.logger.info("No file. Check existing cards...");
-                on_imp = self._navigate_to_creator_tab("import") 
-                if on_imp and not self.check_cards_loaded(): self.logger.warning("No cards loaded (dropdown).")
-                elif not on_imp: self.logger.warning("Cannot check cards, import nav fail.")
-
-            if action=="zip": # "zip" action now means "process and output"
-                if not self.cards: self.get_saved_cards() 
-                if not self.cards: self.logger.error("No cards to process."); return 
-                
-                output_successful = self.process_and_output_all_cards() 
-                
-                if output_successful: 
-                    if self.upload_to_server:
-                        self.logger.info(f"Image upload process complete.")
-                    else:
-                        self.logger.info(f"Image extraction complete. Files are in: {self.output_dir}")
-                else: 
-                    self.logger.error("Image processing and output failed or no images were processed.")
+            output_successful = self.process_and_output_all_cards() 
             
-            # --- NEW: Generate file for failed cards ---
-            if cardconjurer_file:
-                self._write_failed_cards_file(cardconjurer_file)
-            # --- END NEW ---
+            if output_successful: 
+                if self.upload_to_server:
+                    self.logger.info(f"Image upload process complete.")
+                else:
+                    self.logger.info(f"Image output complete. Files are in: {self.output_dir}")
+            else: 
+                self.logger.error("Image processing and output failed or no images were processed.")
+        
+        # --- NEW: Generate file for failed cards ---
+        if cardconjurer_file:
+            self._write_failed_cards_file(cardconjurer_file)
+        # --- END NEW ---
+
+    def close(self, headless=False):
+        """Quits the browser (or only chromedriver when attached to the user's Chrome)."""
+        if self.driver and self.attach_to_chrome:
+            # Leave the user's Chrome running: unregister the helper script, close our tab, stop our chromedriver.
+            if self._js_helpers_script_id not in (None, 'registered'):
+                try: self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': self._js_helpers_script_id})
+                except Exception as e: self.logger.debug("Could not remove page helper script: %s", e)
+            if self._own_tab:
+                try:
+                    self.driver.switch_to.window(self._own_tab); self.driver.close()
+                except Exception as e: self.logger.warning(f"Could not close the tab opened in the attached browser: {e}")
+            try: self.driver.service.stop(); self.logger.info("Detached from browser.")
+            except Exception as e: self.logger.warning(f"Error stopping chromedriver: {e}")
+        elif self.driver:
+            if not headless and sys.stdin.isatty():
+                try: input("Press Enter to close browser...")
+                except EOFError: self.logger.info("Non-interactive, closing.")
+            self.driver.quit(); self.logger.info("Browser closed.")
+        self.driver = None; self._own_tab = None; self._js_helpers_script_id = None
+
+    def run(self, cardconjurer_file=None, action="zip", headless=False, frame=None, args_for_optional_features=None):
+        self.run_many([cardconjurer_file] if cardconjurer_file else [None], action=action, headless=headless, frame=frame,
+                      args_for_optional_features=args_for_optional_features)
 
+    def run_many(self, cardconjurer_files, action="zip", headless=False, frame=None, args_for_optional_features=None):
+        """Processes several .cardconjurer files one after another in a single browser session."""
+        self.logger.info(f"Run (v7.1) action:{action} headless:{headless} frame:{frame} files:{len(cardconjurer_files)}")
+        self._configure_optional_features(args_for_optional_features)
+        try:
+            if not self.open(headless=headless): return
+            for k, cardconjurer_file in enumerate(cardconjurer_files, start=1):
+                if len(cardconjurer_files) > 1: self.logger.info(f"=== File {k}/{len(cardconjurer_files)}: {cardconjurer_file} ===")
+                try: self.process(cardconjurer_file, action=action, frame=frame)
+                except Exception as e: self.logger.error(f"Unhandled error processing {cardconjurer_file}: {e}", exc_info=True)
         except Exception as e: self.logger.error(f"Unhandled run err: {e}",exc_info=True)
-        finally:
-            if self.driver:
-                if not headless and sys.stdin.isatty():
-                    try: input("Press Enter to close browser...")
-                    except EOFError: self.logger.info("Non-interactive, closing.")
-                self.driver.quit(); self.logger.info("Browser closed.")
+        finally: self.close(headless=headless)
+
+# --- Parallel workers: one Chrome per process, each handling a shard of the input file ---
+CHROMEDRIVER_CANDIDATES = ("/usr/bin/chromedriver", "/usr/local/bin/chromedriver", "chromedriver")
+
+@functools.lru_cache(maxsize=None)
+def find_chromedriver() -> Optional[str]:
+    """Resolves the chromedriver binary once per process. shutil.which walks PATH in-process; no shell is forked."""
+    # shutil.which also takes absolute paths, and for those it only checks the file is executable (not merely present).
+    return next(filter(None, (shutil.which(os.path.expanduser(p)) for p in CHROMEDRIVER_CANDIDATES)), None)
+
+MIN_CARDS_PER_WORKER = 5
+# Shards are handed out from a queue, so a worker that drew quick cards takes another shard instead of idling.
+# Each shard costs one file import and priming pass, so there are only a few per worker.
+SHARDS_PER_WORKER = 4
+
+def _workers_arg(value: str) -> int:
+    """argparse type for --workers: a positive integer, or 'auto' for half the CPUs capped at 4."""
+    if value == 'auto': return max(1, min(4, (os.cpu_count() or 2) // 2))
+    try: n = int(value)
+    except ValueError: raise argparse.ArgumentTypeError(f"expected a positive integer or 'auto', got {value!r}")
+    if n < 1: raise argparse.ArgumentTypeError("--workers must be at least 1")
+    return n
+
+def _parallel_worker(worker_id: int, shard_queue, downloader_kwargs: Dict, run_kwargs: Dict) -> Dict[int, Optional[List[str]]]:
+    """
+    Runs one browser in its own process and keeps taking (index, shard file) items off shard_queue until it is
+    empty. Returns {shard index: failed card keys, or None if the shard could not be loaded} for the shards it took.
+    """
+    _skip_unused_log_record_fields()
+    downloader = CardConjurerDownloader(worker_id=worker_id, **downloader_kwargs)
+    downloader._configure_optional_features(run_kwargs.get('args_for_optional_features'))
+    headless = run_kwargs.get('headless', False); finished: Dict[int, Optional[List[str]]] = {}
+    try:
+        if not downloader.open(headless=headless): return finished
+        while True:
+            try: k, shard_file = shard_queue.get_nowait()
+            except queue.Empty: break
+            try:
+                downloader.process(shard_file, frame=run_kwargs.get('frame'))
+                finished[k] = list(downloader.failed_card_keys) if downloader.cards else None
+            except Exception as e:
+                downloader.logger.error(f"Unhandled error processing shard {k}: {e}", exc_info=True); finished[k] = None
+    finally: downloader.close(headless=headless)
+    return finished
+
+def run_parallel(cardconjurer_file: str, workers: int, downloader_kwargs: Dict, run_kwargs: Dict):
+    """
+    Splits the .cardconjurer file into contiguous shards and processes them with `workers` separate
+    processes, each with its own browser, pulling shards from a shared queue. Failed cards from all
+    shards go into one -failed file.
+    """
+    # Resolve chromedriver once here so the spawned workers don't each repeat the lookup.
+    downloader_kwargs = dict(downloader_kwargs, chromedriver_path=downloader_kwargs.get('chromedriver_path') or find_chromedriver())
+    coordinator = CardConjurerDownloader(**downloader_kwargs)
+    if not coordinator._parse_cardconjurer_file_content(cardconjurer_file):
+        coordinator.logger.error(f"Failed to parse {cardconjurer_file}; cannot shard for parallel run."); return
+    cards = [c for c in coordinator.full_card_list_from_file if isinstance(c, dict) and "key" in c]
+    # Each worker pays a full Chrome start-up, so don't split into shards too small to amortise it.
+    workers = max(1, min(workers, -(-len(cards) // MIN_CARDS_PER_WORKER)))
+    if workers == 1:
+        coordinator.logger.info("Only one shard needed; running in a single process.")
+        coordinator.run(cardconjurer_file=cardconjurer_file, **run_kwargs); return
+
+    shard_size = max(MIN_CARDS_PER_WORKER, -(-len(cards) // (workers * SHARDS_PER_WORKER))) # ceil
+    shards = [cards[k:k + shard_size] for k in range(0, len(cards), shard_size)]
+    workers = min(workers, len(shards))
+    coordinator.logger.info(f"Running {workers} workers over {len(cards)} cards in {len(shards)} shards of up to {shard_size} cards.")
+
+    finished: Dict[int, Optional[List[str]]] = {}
+    p = Path(cardconjurer_file)
+    # 'spawn' avoids forking a process that may already hold Selenium/urllib3 state.
+    ctx = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory(prefix="cc_shards_") as shard_dir, ctx.Manager() as manager:
+        shard_queue = manager.Queue()
+        for k, shard in enumerate(shards, start=1):
+            shard_file = Path(shard_dir) / f"{p.stem}-part{k}{p.suffix}"
+            with open(shard_file, 'w', encoding='utf-8') as f: json.dump(shard, f)
+            shard_queue.put((k, str(shard_file)))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {pool.submit(_parallel_worker, w, shard_queue, downloader_kwargs, run_kwargs): w for w in range(1, workers + 1)}
+            for fut in as_completed(futures):
+                w = futures[fut]
+                try:
+                    done = fut.result(); finished.update(done)
+                    coordinator.logger.info(f"Worker {w} finished {len(done)} shard(s).")
+                except Exception as e:
+                    coordinator.logger.error(f"Worker {w} crashed: {e}. Shards it had not finished are marked as failed.")
+
+    failed_keys: List[str] = []
+    for k, shard in enumerate(shards, start=1):
+        shard_failed = finished.get(k)
+        if shard_failed is None:
+            coordinator.logger.error(f"Shard {k} was not processed; marking its {len(shard)} cards as failed.")
+            failed_keys.extend(c["key"] for c in shard)
+        else: failed_keys.extend(shard_failed)
+    coordinator.logger.info(f"Parallel run done: {len(cards) - len(failed_keys)}/{len(cards)} cards OK.")
+    coordinator.failed_card_keys = failed_keys
+    coordinator._write_failed_cards_file(cardconjurer_file)
 
 def main():
+    _skip_unused_log_record_fields()
     p = argparse.ArgumentParser(description='Card Conjurer Downloader - v7.1 with Local/Web Server Output and Auto-Retry File')
-    p.add_argument('--file','-f',required=True,help='.cardconjurer file to load')
+    p.add_argument('--file','-f',required=True,nargs='+',help='.cardconjurer file(s) to load, or a directory of them; all are processed in one browser session')
     p.add_argument('--url',default='https://cardconjurer.app:443',help='Card Conjurer URL')
-    p.add_argument('--output-dir',default=None,help='Local output directory for extracted images and logs. Used if --upload-to-server is not specified.')
+    p.add_argument('--output-dir',default=None,help='Local output directory for images and logs. Used if --upload-to-server is not specified.')
     p.add_argument('--headless',action='store_true',help='Run in headless mode')
-    p.add_argument('--frame',choices=['7th','seventh','8th','eighth','m15','ub'],help='Auto frame setting')
+    p.add_argument('--attach-to-chrome',default=None,metavar='HOST:PORT',help='Drive an already running Chrome started with --remote-debugging-port instead of launching one')
+    p.add_argument('--chrome-user-data-dir',default=None,metavar='DIR',help='Use a persistent Chrome profile (instead of incognito) so the browser cache survives between runs')
+    p.add_argument('--window-size',default=None,metavar='W,H',help='Browser window size (default 1920,1080). The card canvas keeps its own resolution.')
+    p.add_argument('--frame',choices=list(CardConjurerDownloader.FRAME_MAPPING),help='Auto frame setting')
     p.add_argument('--log-level',default='INFO',choices=['DEBUG','INFO','WARNING','ERROR'],help='Console logging level')
+    p.add_argument('--no-batch-capture',action='store_true',help='Capture cards one at a time instead of batching load+capture in the browser')
+    p.add_argument('--workers',type=_workers_arg,default=1,metavar='N|auto',help="Number of parallel browser processes; the card list is split between them ('auto' = half the CPUs, at most 4)")
+    p.add_argument('--output-zip',default=None,metavar='ZIP',help='Write all images into this ZIP archive instead of separate files in --output-dir (logs still go to --output-dir)')
+    p.add_argument('--zip-compression',default='stored',choices=sorted(ZIP_COMPRESSION),help="Compression for --output-zip entries (default 'stored': PNG/JPEG/WebP are already compressed; 'deflated' uses level 1)")
+    p.add_argument('--optimize-png',action='store_true',help='Losslessly re-compress PNGs with Pillow (optimize=True) in background threads; needs python3-pil')
+    p.add_argument('--image-format',default='png',choices=sorted(IMAGE_FORMATS),help='Image format captured from the canvas (jpeg/webp are lossy but much smaller)')
+    p.add_argument('--image-quality',type=float,default=None,metavar='Q',help='Encoder quality 0-1 for --image-format jpeg/webp (default: browser default, ~0.92 jpeg / 0.8 webp)')
+    p.add_argument('--cache',action='store_true',help='Reuse images of unchanged cards from earlier --cache runs instead of capturing them again')
+    p.add_argument('--refresh-cache',action='store_true',help='Capture every card again and replace its cached image (implies --cache), e.g. after Card Conjurer was updated')
+    p.add_argument('--cache-dir',default=None,metavar='DIR',help=f'Where --cache keeps captured images (default {DEFAULT_CACHE_DIR})')
     
     opt_group = p.add_argument_group('Optional Card-Specific Features')
     opt_group.add_argument('--auto-fit-art', action='store_true', help='Enable Auto Fit Art feature.')
@@ -921,7 +2089,24 @@ def main():
     )
     
     a = p.parse_args()
-    if not os.path.exists(a.file): print(f"Error: File not found: {a.file}");sys.exit(1)
+    files = []
+    for f in a.file:
+        if not os.path.exists(f): print(f"Error: File not found: {f}");sys.exit(1)
+        if os.path.isdir(f):
+            # One scandir pass; DirEntry.is_file() uses the dirent type, so no stat() per entry.
+            with os.scandir(f) as entries:
+                found = sorted(e.path for e in entries if e.name.endswith('.cardconjurer') and not e.name.endswith('-failed.cardconjurer') and e.is_file())
+            if not found: print(f"Error: No .cardconjurer files in directory: {f}");sys.exit(1)
+            files.extend(found)
+        else: files.append(f)
+    if a.image_quality is not None:
+        if not 0 < a.image_quality <= 1: p.error("--image-quality must be between 0 (exclusive) and 1.")
+        if a.image_format == 'png': p.error("--image-quality only applies to --image-format jpeg/webp; PNG is lossless.")
+    if a.output_zip and len(files) > 1: p.error("--output-zip takes a single --file; each file would overwrite the archive.")
+    if a.output_zip and a.upload_to_server: p.error("--output-zip only applies to local output, not --upload-to-server.")
+    if a.workers > 1 and a.output_zip: p.error("--output-zip cannot be shared by several --workers; write to --output-dir instead.")
+    if a.workers > 1 and (a.attach_to_chrome or a.chrome_user_data_dir):
+        p.error("--workers cannot share one browser or profile; drop --attach-to-chrome/--chrome-user-data-dir.")
     
     if a.upload_to_server:
         if not a.image_server_base_url:
@@ -931,16 +2116,33 @@ def main():
 
     log_lvl_val = getattr(logging, a.log_level.upper(), logging.INFO)
     
-    downloader = CardConjurerDownloader(
+    downloader_kwargs = dict(
         url=a.url,
         output_dir=a.output_dir,
         log_level=log_lvl_val,
         upload_to_server=a.upload_to_server,
         image_server_base_url=a.image_server_base_url,
         output_server_path=a.output_server_path,
-        overwrite_server_file=a.overwrite_server_file
+        overwrite_server_file=a.overwrite_server_file,
+        image_format=a.image_format,
+        image_quality=a.image_quality,
+        optimize_png=a.optimize_png,
+        output_zip=a.output_zip,
+        zip_compression=a.zip_compression,
+        use_cache=a.cache,
+        refresh_cache=a.refresh_cache,
+        cache_dir=a.cache_dir,
+        window_size=a.window_size,
+        attach_to_chrome=a.attach_to_chrome,
+        chrome_user_data_dir=a.chrome_user_data_dir
     )
-    downloader.run(cardconjurer_file=a.file,headless=a.headless,frame=a.frame, args_for_optional_features=a)
+    run_kwargs = dict(headless=a.headless, frame=a.frame, args_for_optional_features=a)
+    if a.workers > 1:
+        for f in files: run_parallel(f, a.workers, downloader_kwargs, run_kwargs)
+        return
+
+    downloader = CardConjurerDownloader(**downloader_kwargs)
+    downloader.run_many(files, **run_kwargs)
 
 if __name__ == "__main__":
     main()